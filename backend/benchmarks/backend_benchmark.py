@@ -0,0 +1,127 @@
+"""Compare summarizer backends on latency, peak memory and ROUGE drift.
+
+Each backend runs in its own subprocess so peak RSS is measured in isolation.
+ROUGE-1 and ROUGE-L F1 are computed against the fp32 PyTorch summaries of
+the same fixed texts.
+
+Usage: python -m benchmarks.backend_benchmark [--backends pytorch int8 onnx]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import ARTICLES
+
+TEXTS = [
+    ARTICLES["en"]["short"],
+    ARTICLES["en"]["medium"],
+    ARTICLES["en"]["long"],
+    ARTICLES["es"]["medium"],
+]
+
+
+def _worker(backend: str):
+    """Summarize TEXTS with one backend and print the measurements as JSON"""
+    from services.summarization_service import SummarizationService
+
+    start = time.perf_counter()
+    service = SummarizationService(backend=backend)
+    load_seconds = time.perf_counter() - start
+
+    summaries = []
+    latencies = []
+    for text in TEXTS:
+        start = time.perf_counter()
+        summaries.append(service._summarize_sync(text))
+        latencies.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "latencies": latencies,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "summaries": summaries
+    }))
+
+
+def _lcs_length(a: list, b: list) -> int:
+    previous = [0] * (len(b) + 1)
+    for token in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if token == other else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+def _f1(overlap: int, candidate_len: int, reference_len: int) -> float:
+    if not overlap or not candidate_len or not reference_len:
+        return 0.0
+    precision = overlap / candidate_len
+    recall = overlap / reference_len
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_scores(candidate: str, reference: str) -> dict:
+    """ROUGE-1 and ROUGE-L F1 on lower-cased whitespace tokens"""
+    cand = candidate.lower().split()
+    ref = reference.lower().split()
+
+    ref_counts = {}
+    for token in ref:
+        ref_counts[token] = ref_counts.get(token, 0) + 1
+    unigram_overlap = 0
+    for token in cand:
+        if ref_counts.get(token, 0) > 0:
+            ref_counts[token] -= 1
+            unigram_overlap += 1
+
+    return {
+        "rouge1": _f1(unigram_overlap, len(cand), len(ref)),
+        "rougeL": _f1(_lcs_length(cand, ref), len(cand), len(ref)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "int8", "onnx"])
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker)
+        return
+
+    backends = args.backends if "pytorch" in args.backends else ["pytorch"] + args.backends
+    results = {}
+    for backend in backends:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.backend_benchmark", "--worker", backend],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(f"{backend}: failed\n{proc.stderr.strip()[-1000:]}")
+            continue
+        results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    if "pytorch" not in results:
+        print("The fp32 pytorch baseline failed, cannot compute ROUGE drift")
+        return
+
+    baseline = results["pytorch"]["summaries"]
+    print(f"{'backend':<8} {'load s':>7} {'mean s':>7} {'peak MB':>8} {'ROUGE-1':>8} {'ROUGE-L':>8}")
+    for backend, result in results.items():
+        scores = [rouge_scores(c, r) for c, r in zip(result["summaries"], baseline)]
+        rouge1 = sum(s["rouge1"] for s in scores) / len(scores)
+        rougel = sum(s["rougeL"] for s in scores) / len(scores)
+        mean_latency = sum(result["latencies"]) / len(result["latencies"])
+        print(f"{backend:<8} {result['load_seconds']:>7.1f} {mean_latency:>7.2f} "
+              f"{result['peak_rss_mb']:>8.0f} {rouge1:>8.3f} {rougel:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
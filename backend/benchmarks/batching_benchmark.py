@@ -0,0 +1,52 @@
+"""Measure summarization throughput with and without cross-request micro-batching.
+
+Loads the real BART model, so the first run downloads the weights.
+Usage: python -m benchmarks.batching_benchmark [--concurrency 1 4 16] [--batch-size 8]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.corpus import ARTICLES
+from services.batch_inference import BatchingSummarizer
+from services.summarization_service import SummarizationService
+
+
+def _run(service: SummarizationService, concurrency: int, requests: int) -> tuple:
+    """Summarize ``requests`` articles with ``concurrency`` callers; return (seconds, tokens)"""
+    text = ARTICLES["en"]["medium"]
+    # Vary each request slightly so nothing is shared between them
+    texts = [f"Report {i}. {text}" for i in range(requests)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        summaries = list(pool.map(service._summarize_sync, texts))
+    elapsed = time.perf_counter() - start
+
+    tokens = sum(len(service.tokenizer(summary)["input_ids"]) for summary in summaries)
+    return elapsed, tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--wait-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    service = SummarizationService()
+    batcher = BatchingSummarizer(service.summarizer, args.batch_size, args.wait_ms)
+
+    print(f"{'concurrency':>11} {'mode':>9} {'requests':>8} {'seconds':>8} {'tokens/s':>9}")
+    for concurrency in args.concurrency:
+        requests = max(4, concurrency * 2)
+        for mode in ("unbatched", "batched"):
+            service.batcher = batcher if mode == "batched" else None
+            elapsed, tokens = _run(service, concurrency, requests)
+            print(f"{concurrency:>11} {mode:>9} {requests:>8} {elapsed:>8.2f} {tokens / elapsed:>9.1f}")
+
+    print(f"batcher: {batcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Check the token chunker against the corpus and compare it with the old estimate.
+
+For every corpus article this reports how many model calls each chunker needs
+and how many tokens the old 4-characters-per-token chunker loses to truncation.
+It exits with status 1 if the token chunker produces any chunk that would be
+truncated.
+
+Usage: python -m benchmarks.chunking_check
+"""
+import sys
+
+from transformers import AutoTokenizer
+
+from benchmarks.corpus import iter_articles
+from services.text_chunking import TokenChunker
+
+
+def estimate_chunks(text: str, max_chunk_length: int = 900) -> list:
+    """The previous chunker: split on '. ' and assume 4 characters per token"""
+    sentences = text.split('. ')
+    chunks = []
+    current_chunk = ""
+    for sentence in sentences:
+        estimated_tokens = len(current_chunk + sentence) // 4
+        if estimated_tokens > max_chunk_length and current_chunk:
+            chunks.append(current_chunk.strip())
+            current_chunk = sentence
+        else:
+            current_chunk += sentence + ". "
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+    return chunks
+
+
+def main(model_name: str = "facebook/bart-large-cnn") -> int:
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    chunker = TokenChunker(tokenizer)
+    window = chunker.max_tokens
+
+    print(f"token window: {window}")
+    print(f"{'article':<10} {'tokens':>7} {'old calls':>9} {'old lost':>8} {'new calls':>9} {'new max':>7}")
+    failures = 0
+    for language, size, text in iter_articles():
+        total = chunker.count_tokens([text])[0]
+
+        old_lengths = chunker.count_tokens(estimate_chunks(text))
+        old_lost = sum(max(0, length - window) for length in old_lengths)
+
+        new_lengths = chunker.count_tokens(chunker.chunk(text))
+        if max(new_lengths) > window:
+            failures += 1
+
+        print(f"{language + '/' + size:<10} {total:>7} {len(old_lengths):>9} {old_lost:>8} "
+              f"{len(new_lengths):>9} {max(new_lengths):>7}")
+
+    if failures:
+        print(f"FAIL: {failures} article(s) produced chunks longer than the window")
+        return 1
+    print("OK: no chunk exceeds the token window")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
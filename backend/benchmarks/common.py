@@ -0,0 +1,31 @@
+"""Helpers shared by the benchmark scripts.
+
+Run benchmarks from the backend directory, e.g. ``python -m benchmarks.render_pool_benchmark``.
+"""
+import os
+import subprocess
+import tempfile
+
+from moviepy.config import get_setting
+
+SAMPLE_SUMMARY = (
+    "Solar panels convert sunlight directly into electricity using photovoltaic cells. "
+    "Costs have fallen by nearly ninety percent over the last decade. "
+    "Many countries now install more solar capacity than any other power source. "
+    "Storage batteries smooth out the gap between sunny afternoons and evening demand. "
+    "Grid operators are redesigning networks to handle millions of small producers. "
+    "Experts expect solar to become the largest source of electricity by the middle of the century."
+)
+
+
+def make_silent_narration(seconds: float, directory: str = None) -> str:
+    """Write a silent MP3 of the given length and return its path"""
+    directory = directory or tempfile.mkdtemp(prefix="bench_")
+    path = os.path.join(directory, f"silence_{seconds:g}s.mp3")
+    if not os.path.exists(path):
+        subprocess.run([
+            get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", "anullsrc=r=24000:cl=mono",
+            "-t", str(seconds), "-c:a", "libmp3lame", "-b:a", "32k", path
+        ], check=True)
+    return path
@@ -0,0 +1,108 @@
+"""Diff two pipeline benchmark result files.
+
+Levels are matched by concurrency and every headline metric is printed with
+its relative change. With ``--threshold`` the script exits with status 1 when
+a latency or resource metric got worse, or a throughput metric got lower, by
+more than that many percent, so it can gate a CI job.
+
+Usage: python -m benchmarks.compare_results BASELINE.json CANDIDATE.json [--threshold 10]
+"""
+import argparse
+import json
+import sys
+
+# (label, path into a level, whether higher is better)
+METRICS = [
+    ("jobs/min", ("jobs_per_minute",), True),
+    ("video s/s", ("video_seconds_per_second",), True),
+    ("summarize mean s", ("stages", "summarize", "mean"), False),
+    ("tts mean s", ("stages", "tts", "mean"), False),
+    ("render mean s", ("stages", "render", "mean"), False),
+    ("total mean s", ("stages", "total", "mean"), False),
+    ("total p95 s", ("stages", "total", "p95"), False),
+    ("peak RSS MB", ("peak_rss_mb",), False),
+    ("CPU utilization", ("cpu_utilization",), None),
+    ("output bytes", ("output_bytes", "mean"), None),
+]
+
+
+def _lookup(level: dict, path: tuple):
+    value = level
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _step_metrics(baseline: dict, candidate: dict) -> list:
+    """Mean time of each render step recorded in both runs"""
+    steps = sorted(set(baseline.get("render_steps", {})) & set(candidate.get("render_steps", {})))
+    return [(f"step {step} mean s", ("render_steps", step, "mean"), False) for step in steps]
+
+
+def compare(baseline: dict, candidate: dict, threshold: float = None, min_seconds: float = 0.05) -> list:
+    """Print the comparison table and return the regressions beyond the threshold.
+
+    Timings that moved by less than ``min_seconds`` are never counted as
+    regressions, so near-zero stages don't trip the gate on noise.
+    """
+    for key in ("summarizer", "tts", "service", "encoder", "profile", "languages", "sizes"):
+        if baseline["settings"].get(key) != candidate["settings"].get(key):
+            print(f"warning: runs differ in {key}: {baseline['settings'].get(key)} vs {candidate['settings'].get(key)}")
+
+    candidate_levels = {level["concurrency"]: level for level in candidate["levels"]}
+    regressions = []
+    for base_level in baseline["levels"]:
+        concurrency = base_level["concurrency"]
+        cand_level = candidate_levels.get(concurrency)
+        if cand_level is None:
+            print(f"concurrency {concurrency}: missing from the candidate run")
+            continue
+
+        print(f"\nconcurrency {concurrency}")
+        print(f"  {'metric':<24} {'baseline':>12} {'candidate':>12} {'change':>8}")
+        for label, path, higher_is_better in METRICS + _step_metrics(base_level, cand_level):
+            old = _lookup(base_level, path)
+            new = _lookup(cand_level, path)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            print(f"  {label:<24} {old:>12.3f} {new:>12.3f} {change:>+7.1f}%")
+
+            if threshold is None or higher_is_better is None:
+                continue
+            if label.endswith(" s") and abs(new - old) < min_seconds:
+                continue
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append(f"concurrency {concurrency}: {label} {change:+.1f}%")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, help="fail on regressions larger than this many percent")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="ignore timing changes smaller than this many seconds (default: 0.05)")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    print(f"baseline {baseline.get('git_revision')} ({baseline.get('created_at')}), "
+          f"candidate {candidate.get('git_revision')} ({candidate.get('created_at')})")
+    regressions = compare(baseline, candidate, args.threshold, args.min_seconds)
+    if regressions:
+        print("\nRegressions beyond threshold:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Fixed article corpus used by the benchmarks.
+
+Articles are built from fixed paragraphs so every run sees byte-identical input.
+"""
+
+EN_PARAGRAPHS = [
+    "Solar power has moved from a niche technology to one of the cheapest sources of new electricity "
+    "in most of the world. Photovoltaic cells convert sunlight directly into electric current, and the "
+    "price of a typical panel has fallen by almost ninety percent since 2010. Manufacturing at enormous "
+    "scale, better silicon wafers and more efficient cell designs all contributed to the decline. As a "
+    "result, utilities now build large solar farms without subsidies, and households in sunny regions "
+    "can recover the cost of rooftop systems within a few years.",
+
+    "The main weakness of solar energy is that it follows the sun rather than demand. Output peaks at "
+    "midday and disappears at night, while electricity use often peaks in the early evening. Grid "
+    "operators have responded by pairing solar farms with lithium-ion batteries that store surplus "
+    "energy in the afternoon and release it after sunset. Battery prices have dropped quickly as well, "
+    "driven largely by the electric vehicle industry, which makes storage projects increasingly "
+    "attractive for investors.",
+
+    "Integrating millions of small producers also changes how electricity networks are designed. "
+    "Traditional grids were built for power to flow in one direction, from a few large plants to many "
+    "consumers. Rooftop panels reverse that flow on sunny days, which can overload local transformers "
+    "and push voltages outside safe limits. Engineers are installing smarter inverters, automated "
+    "controls and new market rules that pay households for flexibility, such as shifting the charging "
+    "of a car to the hours when solar output is highest.",
+
+    "Policy has played a large role in the spread of solar power. Early feed-in tariffs in Germany "
+    "guaranteed prices for solar electricity and created a market big enough for manufacturers to "
+    "scale up. China then invested heavily in factories, and today it produces the large majority of "
+    "the world's panels. Critics point to trade disputes and concerns about supply chains, while "
+    "supporters argue that cheap panels have accelerated the energy transition far beyond early "
+    "forecasts.",
+
+    "Looking ahead, most energy agencies expect solar to become the largest source of electricity "
+    "generation before the middle of the century. Research continues into perovskite cells, which "
+    "could be printed cheaply and stacked on top of silicon to capture more of the spectrum. Recycling "
+    "programs are being developed for the first generation of panels that will soon reach the end of "
+    "their working lives. The challenge is no longer whether solar can compete, but how quickly "
+    "networks, storage and regulations can adapt to it.",
+]
+
+HI_PARAGRAPHS = [
+    "सौर ऊर्जा अब एक सीमित तकनीक नहीं रही, बल्कि दुनिया के अधिकांश हिस्सों में नई बिजली का सबसे सस्ता स्रोत बन "
+    "गई है। फोटोवोल्टिक सेल सूर्य के प्रकाश को सीधे बिजली में बदलते हैं। 2010 के बाद से एक सामान्य पैनल की कीमत "
+    "लगभग नब्बे प्रतिशत कम हो गई है। बड़े पैमाने पर उत्पादन, बेहतर सिलिकॉन वेफर और अधिक कुशल सेल डिज़ाइन ने इस "
+    "गिरावट में योगदान दिया। इसी कारण अब बिजली कंपनियाँ बिना सब्सिडी के बड़े सौर संयंत्र बना रही हैं।",
+
+    "सौर ऊर्जा की मुख्य कमजोरी यह है कि यह मांग के बजाय सूर्य का अनुसरण करती है। उत्पादन दोपहर में सबसे अधिक "
+    "होता है और रात में समाप्त हो जाता है, जबकि बिजली की खपत अक्सर शाम को सबसे अधिक होती है। ग्रिड संचालक सौर "
+    "संयंत्रों को लिथियम-आयन बैटरियों के साथ जोड़ रहे हैं, जो दोपहर की अतिरिक्त ऊर्जा को जमा करके सूर्यास्त के "
+    "बाद उपलब्ध कराती हैं। इलेक्ट्रिक वाहन उद्योग के कारण बैटरियों की कीमतें भी तेज़ी से गिरी हैं।",
+
+    "लाखों छोटे उत्पादकों को जोड़ने से बिजली नेटवर्क की रूपरेखा भी बदल रही है। पारंपरिक ग्रिड इस तरह बनाए गए "
+    "थे कि बिजली कुछ बड़े संयंत्रों से बहुत से उपभोक्ताओं की ओर एक ही दिशा में बहे। छत पर लगे पैनल धूप वाले दिनों "
+    "में इस प्रवाह को उलट देते हैं, जिससे स्थानीय ट्रांसफार्मर पर दबाव बढ़ सकता है। इंजीनियर अब स्मार्ट इन्वर्टर, "
+    "स्वचालित नियंत्रण और ऐसे नए बाज़ार नियम अपना रहे हैं जो घरों को लचीलेपन के लिए भुगतान करते हैं।",
+]
+
+TA_PARAGRAPHS = [
+    "சூரிய ஆற்றல் இப்போது ஒரு சிறிய தொழில்நுட்பம் அல்ல, உலகின் பெரும்பாலான பகுதிகளில் புதிய மின்சாரத்தின் மிகக் "
+    "குறைந்த செலவான ஆதாரமாக மாறியுள்ளது. ஒளிமின்னழுத்த கலங்கள் சூரிய ஒளியை நேரடியாக மின்சாரமாக மாற்றுகின்றன. "
+    "2010 முதல் ஒரு சாதாரண பலகையின் விலை ஏறக்குறைய தொண்ணூறு சதவீதம் குறைந்துள்ளது. பெரிய அளவிலான உற்பத்தி, "
+    "சிறந்த சிலிக்கான் தகடுகள் மற்றும் திறமையான கல வடிவமைப்புகள் இந்த வீழ்ச்சிக்கு காரணமாக அமைந்தன.",
+
+    "சூரிய ஆற்றலின் முக்கிய குறைபாடு என்னவென்றால், அது தேவையை அல்லாமல் சூரியனைப் பின்தொடர்கிறது. உற்பத்தி "
+    "நண்பகலில் உச்சத்தை அடைந்து இரவில் மறைந்துவிடுகிறது, ஆனால் மின்சார பயன்பாடு பெரும்பாலும் மாலையில் "
+    "அதிகமாக இருக்கும். மின் கட்டமைப்பு இயக்குநர்கள் சூரிய பண்ணைகளை லித்தியம்-அயன் மின்கலங்களுடன் இணைத்து, "
+    "மதிய நேர உபரி ஆற்றலை சேமித்து சூரியன் மறைந்த பிறகு வழங்குகின்றனர்.",
+
+    "லட்சக்கணக்கான சிறிய உற்பத்தியாளர்களை இணைப்பது மின் வலையமைப்புகளின் வடிவமைப்பையும் மாற்றுகிறது. "
+    "பாரம்பரிய வலையமைப்புகள் சில பெரிய நிலையங்களிலிருந்து பல நுகர்வோருக்கு ஒரே திசையில் மின்சாரம் பாயும் "
+    "வகையில் கட்டப்பட்டன. கூரை மேல் பலகைகள் வெயில் நாட்களில் இந்த ஓட்டத்தை தலைகீழாக மாற்றுகின்றன. பொறியாளர்கள் "
+    "இப்போது நுண்ணறிவு இன்வர்ட்டர்கள் மற்றும் தானியங்கி கட்டுப்பாடுகளை நிறுவுகின்றனர்.",
+]
+
+ES_PARAGRAPHS = [
+    "La energía solar ha pasado de ser una tecnología de nicho a una de las fuentes de electricidad nueva "
+    "más baratas del mundo. Las células fotovoltaicas convierten la luz del sol directamente en corriente "
+    "eléctrica, y el precio de un panel típico ha caído casi un noventa por ciento desde 2010. La fabricación "
+    "a gran escala, las mejores obleas de silicio y los diseños de células más eficientes contribuyeron a "
+    "esa caída.",
+
+    "La principal debilidad de la energía solar es que sigue al sol y no a la demanda. La producción alcanza "
+    "su máximo al mediodía y desaparece por la noche, mientras que el consumo suele ser mayor al anochecer. "
+    "Los operadores de red combinan los parques solares con baterías de iones de litio que almacenan el "
+    "excedente de la tarde y lo liberan después de la puesta del sol.",
+
+    "Integrar millones de pequeños productores también cambia el diseño de las redes eléctricas. Las redes "
+    "tradicionales se construyeron para que la electricidad fluyera en una sola dirección, desde unas pocas "
+    "centrales hacia muchos consumidores. Los paneles en los tejados invierten ese flujo en los días soleados, "
+    "por lo que los ingenieros instalan inversores inteligentes y controles automáticos.",
+]
+
+ARTICLES = {
+    "en": {
+        "short": EN_PARAGRAPHS[0],
+        "medium": " ".join(EN_PARAGRAPHS[:3]),
+        "long": " ".join(EN_PARAGRAPHS * 4),
+    },
+    "hi": {
+        "short": HI_PARAGRAPHS[0],
+        "medium": " ".join(HI_PARAGRAPHS),
+        "long": " ".join(HI_PARAGRAPHS * 6),
+    },
+    "ta": {
+        "short": TA_PARAGRAPHS[0],
+        "medium": " ".join(TA_PARAGRAPHS),
+        "long": " ".join(TA_PARAGRAPHS * 6),
+    },
+    "es": {
+        "short": ES_PARAGRAPHS[0],
+        "medium": " ".join(ES_PARAGRAPHS),
+        "long": " ".join(ES_PARAGRAPHS * 6),
+    },
+}
+
+
+def iter_articles(languages=None, sizes=None):
+    """Yield (language, size, text) for the selected part of the corpus"""
+    for language, by_size in ARTICLES.items():
+        if languages and language not in languages:
+            continue
+        for size, text in by_size.items():
+            if sizes and size not in sizes:
+                continue
+            yield language, size, text
@@ -0,0 +1,111 @@
+"""Measure total memory of the API at several worker counts.
+
+For each worker count the API is started with ``uvicorn --workers N``, once
+with every worker loading its own model and once with the workers sharing an
+inference sidecar. After all workers report ready, the proportional set size
+(PSS) of the whole process tree is summed, which counts shared pages once.
+Linux only, because it reads /proc.
+
+Usage: python -m benchmarks.memory_benchmark [--workers 1 2 4]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+def _children(pid: int) -> list:
+    pids = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return pids
+
+
+def _tree(pid: int) -> list:
+    pids = [pid]
+    for child in _children(pid):
+        pids.extend(_tree(child))
+    return pids
+
+
+def _pss_mb(pid: int) -> float:
+    total_kb = 0
+    for proc in _tree(pid):
+        try:
+            with open(f"/proc/{proc}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("Pss:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            pass
+    return total_kb / 1024
+
+
+def _wait_ready(port: int, workers: int, timeout: float):
+    """Poll the readiness probe until every worker has answered ready"""
+    url = f"http://127.0.0.1:{port}/health/ready"
+    deadline = time.monotonic() + timeout
+    consecutive = 0
+    while consecutive < workers * 3:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"API did not become ready within {timeout:.0f}s")
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                consecutive = consecutive + 1 if response.status == 200 else 0
+        except Exception:
+            consecutive = 0
+            time.sleep(1)
+
+
+def _measure(workers: int, sidecar: bool, port: int, timeout: float) -> float:
+    env = dict(os.environ, MODEL_LOADING="background")
+    processes = []
+    socket_path = f"/tmp/ai-video-bench-{os.getpid()}.sock"
+    try:
+        if sidecar:
+            env["SUMMARIZER_SOCKET"] = socket_path
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "services.inference_sidecar", "--socket", socket_path],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            ))
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers)],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        ))
+        _wait_ready(port, workers, timeout)
+        return sum(_pss_mb(proc.pid) for proc in processes)
+    finally:
+        for proc in processes:
+            proc.terminate()
+        for proc in processes:
+            proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'workers':>7} {'per-worker MB':>14} {'sidecar MB':>11}")
+    for workers in args.workers:
+        separate = _measure(workers, sidecar=False, port=args.port, timeout=args.timeout)
+        shared = _measure(workers, sidecar=True, port=args.port, timeout=args.timeout)
+        results.append({"workers": workers, "per_worker_mb": separate, "sidecar_mb": shared})
+        print(f"{workers:>7} {separate:>14.0f} {shared:>11.0f}")
+
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
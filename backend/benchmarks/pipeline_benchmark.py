@@ -0,0 +1,268 @@
+"""End-to-end benchmark of the generation pipeline at several concurrency levels.
+
+Every article of the fixed corpus (short, medium and long texts in en, hi, ta
+and es) goes through summarization, narration and rendering, with up to N
+jobs in flight at once. Each concurrency level runs in its own subprocess, so
+peak RSS and CPU time are measured in isolation. Per level the benchmark
+reports wall time per stage (summarize, tts, render, plus the render steps
+recorded by services.metrics), peak RSS, CPU utilization, output size and
+throughput, and writes everything to a JSON file that
+``python -m benchmarks.compare_results`` can diff against another run.
+
+By default nothing touches the network or loads BART: summaries come from a
+deterministic extractive stub and narration from the ``stub`` TTS engine.
+``--summarizer tiny`` runs the real SummarizationService with a tiny model,
+``--summarizer bart`` with the production model; ``--tts gtts`` or
+``--tts espeak`` select a real engine.
+
+Usage: python -m benchmarks.pipeline_benchmark [--concurrency 1 2 4] [--sizes short medium]
+       [--languages en hi] [--encoder ffmpeg] [--profile preview] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+from benchmarks.corpus import iter_articles
+
+STAGES = ("summarize", "tts", "render", "total")
+TINY_MODEL = "sshleifer/distilbart-xsum-12-1"
+
+
+class ExtractiveSummarizer:
+    """Deterministic stand-in for BART: the leading sentences of the text, up to ~80 words"""
+
+    def __init__(self, max_words: int = 80):
+        self.max_words = max_words
+
+    async def summarize(self, text: str) -> str:
+        from services.text_chunking import split_sentences
+        summary = []
+        words = 0
+        for sentence in split_sentences(text):
+            if summary and words + len(sentence.split()) > self.max_words:
+                break
+            summary.append(sentence)
+            words += len(sentence.split())
+        return " ".join(summary)
+
+
+def _summarizer(name: str):
+    if name == "stub":
+        return ExtractiveSummarizer()
+    from services.summarization_service import SummarizationService
+    model_name = TINY_MODEL if name == "tiny" else "facebook/bart-large-cnn"
+    return SummarizationService(model_name=model_name)
+
+
+def _video_service(name: str):
+    if name == "simple":
+        from services.simple_video_service import SimpleVideoService
+        return SimpleVideoService()
+    from services.enhanced_video_service import EnhancedVideoService
+    return EnhancedVideoService(warm_layers=True)
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summary_stats(values: list) -> dict:
+    return {
+        "mean": statistics.fmean(values),
+        "p50": _percentile(values, 0.5),
+        "p95": _percentile(values, 0.95),
+        "max": max(values),
+    }
+
+
+def _cpu_seconds() -> float:
+    """User plus system time of this process and of its finished children (ffmpeg)"""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+async def _run_level(args, concurrency: int) -> dict:
+    from services import metrics
+    from services.tts_engines import load_engine
+    from services.tts_service import TTSService
+    from services.workspace import WorkspaceManager
+
+    summarizer = _summarizer(args.summarizer)
+    tts_service = TTSService(engine=load_engine(args.tts), max_workers=args.tts_workers)
+    video_service = _video_service(args.service)
+    workspaces = WorkspaceManager()
+    # Start-up work (layer warm-up, model load) is not part of any job
+    metrics.REGISTRY.drain()
+
+    # SimpleVideoService always renders at 720p
+    profile = {"profile": args.profile} if args.service == "enhanced" else {}
+    articles = list(iter_articles(args.languages, args.sizes)) * args.repeat
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_job(language: str, size: str, text: str) -> dict:
+        async with semaphore:
+            video_id = f"bench_{uuid.uuid4().hex[:12]}"
+            timings = {}
+            job_start = time.perf_counter()
+
+            start = time.perf_counter()
+            summary = await summarizer.summarize(text)
+            timings["summarize"] = time.perf_counter() - start
+
+            with workspaces.create(video_id) as workspace:
+                start = time.perf_counter()
+                narration = await tts_service.narrate(summary, language, video_id, work_dir=workspace.path)
+                timings["tts"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                video_path = await video_service.create_video(
+                    summary, narration["audio_path"], video_id,
+                    encoder=args.encoder, narration=narration, work_dir=workspace.path, **profile
+                )
+                timings["render"] = time.perf_counter() - start
+            timings["total"] = time.perf_counter() - job_start
+
+            record = {
+                "language": language,
+                "size": size,
+                "input_chars": len(text),
+                "slides": len(narration["sentences"]),
+                "video_seconds": sum(narration["durations"]),
+                "output_bytes": os.path.getsize(video_path),
+                "seconds": timings,
+            }
+            os.remove(video_path)
+            return record
+
+    cpu_start = _cpu_seconds()
+    wall_start = time.perf_counter()
+    jobs = await asyncio.gather(*[run_job(*article) for article in articles])
+    wall = time.perf_counter() - wall_start
+    cpu = _cpu_seconds() - cpu_start
+
+    steps = {}
+    for name, state in metrics.REGISTRY.drain().get("video_render_step_seconds", {}).items():
+        labels = dict(name)
+        step = labels["step"] + (f":{labels['encoder']}" if "encoder" in labels else "")
+        _, total, count = state
+        steps[step] = {"count": count, "seconds": total, "mean": total / count if count else 0.0}
+
+    return {
+        "concurrency": concurrency,
+        "jobs": len(jobs),
+        "wall_seconds": wall,
+        "jobs_per_minute": len(jobs) / wall * 60,
+        "video_seconds_per_second": sum(job["video_seconds"] for job in jobs) / wall,
+        # Share of all cores kept busy, counting ffmpeg subprocesses
+        "cpu_utilization": cpu / wall / (os.cpu_count() or 1),
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_child_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        "output_bytes": _summary_stats([job["output_bytes"] for job in jobs]),
+        "stages": {stage: _summary_stats([job["seconds"][stage] for job in jobs]) for stage in STAGES},
+        "render_steps": steps,
+        "job_records": jobs,
+    }
+
+
+def _worker(args, concurrency: int):
+    """Run one concurrency level in a scratch directory and print the result as JSON"""
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as work_dir:
+        os.chdir(work_dir)
+        result = asyncio.run(_run_level(args, concurrency))
+    print(json.dumps(result))
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--languages", nargs="+", choices=["en", "hi", "ta", "es"])
+    parser.add_argument("--sizes", nargs="+", choices=["short", "medium", "long"])
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the selected articles per level")
+    parser.add_argument("--summarizer", choices=["stub", "tiny", "bart"], default="stub")
+    parser.add_argument("--tts", choices=["stub", "espeak", "gtts"], default="stub")
+    parser.add_argument("--tts-workers", type=int, default=4)
+    parser.add_argument("--service", choices=["enhanced", "simple"], default="enhanced")
+    parser.add_argument("--encoder", choices=["moviepy", "ffmpeg", "hls"], default="ffmpeg")
+    parser.add_argument("--profile", choices=["preview", "standard", "archive"], default="standard")
+    parser.add_argument("--output", help="where to write the JSON results (default: pipeline-<time>.json)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args, args.worker)
+        return
+
+    # The worker runs from a scratch directory, so it needs the backend on its path
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [backend_dir, os.environ.get("PYTHONPATH")]))}
+
+    levels = []
+    for concurrency in args.concurrency:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.pipeline_benchmark", *sys.argv[1:], "--worker", str(concurrency)],
+            capture_output=True, text=True, env=env
+        )
+        if proc.returncode != 0:
+            print(f"concurrency {concurrency}: failed\n{proc.stderr.strip()[-1000:]}")
+            continue
+        level = json.loads(proc.stdout.strip().splitlines()[-1])
+        levels.append(level)
+        stages = level["stages"]
+        print(f"concurrency {concurrency}: {level['jobs']} jobs in {level['wall_seconds']:.1f}s, "
+              f"{level['jobs_per_minute']:.1f} jobs/min, CPU {level['cpu_utilization'] * 100:.0f}%, "
+              f"peak RSS {level['peak_rss_mb']:.0f} MB, "
+              + ", ".join(f"{stage} {stages[stage]['mean']:.2f}s" for stage in STAGES))
+
+    results = {
+        "benchmark": "pipeline",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": _git_revision(),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "settings": {
+            "summarizer": args.summarizer,
+            "tts": args.tts,
+            "tts_workers": args.tts_workers,
+            "service": args.service,
+            "encoder": args.encoder,
+            "profile": args.profile,
+            "languages": args.languages,
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+        },
+        "levels": levels,
+    }
+    output = args.output or f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare render throughput of the thread executor and the process pool.
+
+Usage: python -m benchmarks.render_pool_benchmark [--videos 8] [--workers 4]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from benchmarks.common import SAMPLE_SUMMARY, make_silent_narration
+from services.enhanced_video_service import EnhancedVideoService
+from services.render_pool import RenderPool
+
+
+async def _render_batch(service: EnhancedVideoService, audio_path: str, videos: int) -> float:
+    """Render ``videos`` videos concurrently and return the wall time"""
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        service.create_video(SAMPLE_SUMMARY, audio_path, f"bench_{uuid.uuid4()}")
+        for _ in range(videos)
+    ])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=8, help="videos rendered per backend")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="process pool size")
+    parser.add_argument("--seconds", type=float, default=24.0, help="narration length per video")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_render_")
+    audio_path = make_silent_narration(args.seconds, work_dir)
+
+    thread_service = EnhancedVideoService()
+    thread_service.output_dir = work_dir
+
+    pool = RenderPool(num_workers=args.workers)
+    pool.start()
+    process_service = EnhancedVideoService(render_pool=pool)
+    process_service.output_dir = work_dir
+
+    try:
+        results = {}
+        for name, service in (("thread", thread_service), ("process", process_service)):
+            elapsed = asyncio.run(_render_batch(service, audio_path, args.videos))
+            results[name] = args.videos / elapsed * 60
+            print(f"{name:>8}: {args.videos} videos in {elapsed:6.1f}s -> {results[name]:6.2f} videos/min")
+
+        print(f" speedup: {results['process'] / results['thread']:.2f}x with {args.workers} workers")
+    finally:
+        pool.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
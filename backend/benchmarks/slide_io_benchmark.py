@@ -0,0 +1,65 @@
+"""Measure what the in-memory slide pipeline saves over the PNG round-trip.
+
+For every sentence of the sample summary this times the previous path
+(draw, save a quality=95 PNG to disk, load it into an ImageClip, delete it)
+against the in-memory path (draw, wrap the array in an ImageClip), and
+counts the bytes the PNG path wrote and read back.
+
+Usage: python -m benchmarks.slide_io_benchmark [--rounds 5]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from moviepy.editor import ImageClip
+from PIL import Image
+
+from benchmarks.common import SAMPLE_SUMMARY
+from services.enhanced_video_service import EnhancedVideoService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5, help="passes over the sample summary")
+    args = parser.parse_args()
+
+    service = EnhancedVideoService(warm_layers=True)
+    spec = service.build_render_spec(SAMPLE_SUMMARY, os.devnull, "bench")
+    scenes = list(zip(spec['sentences'], spec['scene_types'])) * args.rounds
+    work_dir = tempfile.mkdtemp(prefix="bench_slides_")
+
+    try:
+        png_seconds = 0.0
+        png_bytes = 0
+        for i, (sentence, scene_type) in enumerate(scenes):
+            start = time.perf_counter()
+            frame = service._create_character_scene(sentence, scene_type)
+            image_path = os.path.join(work_dir, f"scene_{i}.png")
+            Image.fromarray(frame).save(image_path, quality=95)
+            clip = ImageClip(image_path, duration=4)
+            png_bytes += os.path.getsize(image_path)
+            os.remove(image_path)
+            png_seconds += time.perf_counter() - start
+            clip.close()
+
+        memory_seconds = 0.0
+        for sentence, scene_type in scenes:
+            start = time.perf_counter()
+            clip = ImageClip(service._create_character_scene(sentence, scene_type), duration=4)
+            memory_seconds += time.perf_counter() - start
+            clip.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    slides = len(scenes)
+    print(f"{'PNG round-trip':>15}: {png_seconds / slides * 1000:7.1f} ms/slide")
+    print(f"{'in-memory':>15}: {memory_seconds / slides * 1000:7.1f} ms/slide")
+    # Every PNG was written once and read back once
+    print(f"{'I/O saved':>15}: {2 * png_bytes / slides / 1024:7.0f} KiB/slide "
+          f"({2 * png_bytes / 1024 / 1024:.1f} MiB over {slides} slides)")
+
+
+if __name__ == "__main__":
+    main()
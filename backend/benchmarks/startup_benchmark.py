@@ -0,0 +1,51 @@
+"""Measure how long importing the API takes and when the model becomes ready.
+
+Each run starts a fresh interpreter, imports ``main`` and then waits for the
+summarization model, for every MODEL_LOADING mode.
+
+Usage: python -m benchmarks.startup_benchmark [--runs 3] [--modes eager background lazy]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter() - start
+if main.config.MODEL_LOADING == "background":
+    main.summarization_service.start_warmup()
+main.summarization_service.ensure_loaded()
+ready = time.perf_counter() - start
+print(json.dumps({"import_seconds": imported, "ready_seconds": ready}))
+"""
+
+
+def _probe(mode: str) -> dict:
+    env = dict(os.environ, MODEL_LOADING=mode)
+    proc = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode} run failed:\n{proc.stderr.strip()[-1000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", default=["eager", "background", "lazy"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<11} {'import s':>9} {'ready s':>8}  (median of {args.runs})")
+    for mode in args.modes:
+        runs = [_probe(mode) for _ in range(args.runs)]
+        imported = statistics.median(r["import_seconds"] for r in runs)
+        ready = statistics.median(r["ready_seconds"] for r in runs)
+        print(f"{mode:<11} {imported:>9.2f} {ready:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare the old prefix-measuring word wrap with the cached layout engine.
+
+Wraps long English sentences and Hindi and Tamil paragraphs from the corpus
+at slide width, and reports layouts/sec for both. The old wrap calls
+``textbbox`` on the growing line for every word and again on every finished
+line for centering; the engine measures each word once per font.
+
+Usage: python -m benchmarks.text_layout_benchmark [--rounds 20]
+"""
+import argparse
+import time
+
+from PIL import Image, ImageDraw
+
+from benchmarks.corpus import EN_PARAGRAPHS, HI_PARAGRAPHS, TA_PARAGRAPHS
+from services.fonts import get_registry
+from services.text_layout import TextLayoutEngine
+
+SLIDE_SIZE = (1280, 720)
+FONT_SIZE = 48
+MAX_WIDTH = SLIDE_SIZE[0] - 200
+
+CASES = {
+    "en long sentence": [" ".join(EN_PARAGRAPHS[:2])],
+    "hi paragraphs": HI_PARAGRAPHS,
+    "ta paragraphs": TA_PARAGRAPHS,
+}
+
+
+def prefix_wrap(draw: ImageDraw.ImageDraw, text: str, font) -> list:
+    """The previous wrap: re-measure the whole line for every word, then once more to center it"""
+    lines = []
+    current_line = ""
+    for word in text.split():
+        test_line = current_line + " " + word if current_line else word
+        bbox = draw.textbbox((0, 0), test_line, font=font)
+        if bbox[2] - bbox[0] < MAX_WIDTH:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+
+    positions = []
+    for line in lines:
+        bbox = draw.textbbox((0, 0), line, font=font)
+        positions.append((SLIDE_SIZE[0] - (bbox[2] - bbox[0])) // 2)
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    draw = ImageDraw.Draw(Image.new("RGB", SLIDE_SIZE))
+    registry = get_registry()
+    engine = TextLayoutEngine(registry)
+    # No shrinking, so both sides wrap at the same font size
+    box = (100, 0, MAX_WIDTH, 10 ** 6)
+
+    print(f"{'case':<18} {'lines':>5} {'textbbox/s':>11} {'engine/s':>9} {'speedup':>8}")
+    for name, texts in CASES.items():
+        fonts = [registry.font_for_text(text, FONT_SIZE) for text in texts]
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            old_lines = sum(len(prefix_wrap(draw, text, font)) for text, font in zip(texts, fonts))
+        old_rate = args.rounds * len(texts) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            new_lines = sum(len(engine.layout(text, box, FONT_SIZE)["lines"]) for text in texts)
+        new_rate = args.rounds * len(texts) / (time.perf_counter() - start)
+
+        print(f"{name:<18} {new_lines:>5} {old_rate:>11.1f} {new_rate:>9.1f} {new_rate / old_rate:>7.1f}x"
+              + ("" if new_lines == old_lines else f"  (old wrap: {old_lines} lines)"))
+
+
+if __name__ == "__main__":
+    main()
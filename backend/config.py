@@ -0,0 +1,109 @@
+"""Runtime configuration for the AI Video Generator backend.
+
+Every setting can be overridden with an environment variable of the same name.
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Environment variable {name} must be an integer, got {value!r}")
+
+
+def _env_str(name: str, default: str) -> str:
+    """Read a string setting from the environment"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip()
+
+
+# Job queue
+RENDER_WORKERS = _env_int("RENDER_WORKERS", 2)      # Jobs processed concurrently
+JOB_QUEUE_SIZE = _env_int("JOB_QUEUE_SIZE", 16)     # Jobs waiting before we answer 429
+JOB_TTL_SECONDS = _env_int("JOB_TTL_SECONDS", 3600) # How long finished jobs stay queryable
+
+# Rendering: "thread" renders in the event loop's thread pool, "process" uses a process pool
+RENDER_BACKEND = _env_str("RENDER_BACKEND", "thread")
+RENDER_PROCESSES = _env_int("RENDER_PROCESSES", 0)  # 0 means one per CPU core
+
+# Render profile used when a request doesn't pick one: "preview", "standard" or "archive"
+RENDER_PROFILE = _env_str("RENDER_PROFILE", "standard")
+
+# Summary cache
+SUMMARY_CACHE_DIR = _env_str("SUMMARY_CACHE_DIR", "cache/summaries")
+SUMMARY_CACHE_MEMORY_ENTRIES = _env_int("SUMMARY_CACHE_MEMORY_ENTRIES", 256)
+SUMMARY_CACHE_MAX_MB = _env_int("SUMMARY_CACHE_MAX_MB", 64)  # 0 disables the cache
+
+# Micro-batching of summarization chunks across concurrent requests (1 disables it)
+SUMMARY_BATCH_SIZE = _env_int("SUMMARY_BATCH_SIZE", 8)
+SUMMARY_BATCH_WAIT_MS = _env_int("SUMMARY_BATCH_WAIT_MS", 10)
+
+# Summarization inference backend: "pytorch" (fp32), "int8" (dynamic quantization) or "onnx"
+SUMMARIZER_BACKEND = _env_str("SUMMARIZER_BACKEND", "pytorch")
+ONNX_CACHE_DIR = _env_str("ONNX_CACHE_DIR", "cache/onnx")
+
+# When to load the summarization model: "eager" (at import), "background" (warm-up task
+# started with the server) or "lazy" (on the first request)
+MODEL_LOADING = _env_str("MODEL_LOADING", "background")
+
+# Unix socket of a shared inference sidecar (python -m services.inference_sidecar).
+# When set, API workers send summarization there instead of loading their own model.
+SUMMARIZER_SOCKET = _env_str("SUMMARIZER_SOCKET", "")
+
+# Narration is synthesized per sentence: concurrent TTS requests across all jobs,
+# and retries of a failed sentence before the job fails
+TTS_WORKERS = _env_int("TTS_WORKERS", 4)
+TTS_RETRIES = _env_int("TTS_RETRIES", 2)
+
+# Narration engine: "gtts" (Google, needs network), "espeak" (local espeak-ng) or "stub"
+# (deterministic tones, for CI). TTS_VOICE is the gTTS accent domain or the espeak voice name.
+TTS_ENGINE = _env_str("TTS_ENGINE", "gtts")
+TTS_VOICE = _env_str("TTS_VOICE", "")
+
+# Narrated sentences reused across requests; 0 disables the cache
+TTS_CACHE_DIR = _env_str("TTS_CACHE_DIR", "cache/tts")
+TTS_CACHE_MAX_MB = _env_int("TTS_CACHE_MAX_MB", 256)
+
+# Pre-rendered static scene layers (characters, scene elements, border); 0 disables the cache
+SCENE_LAYER_CACHE_SIZE = _env_int("SCENE_LAYER_CACHE_SIZE", 16)
+SCENE_LAYER_WARMUP = _env_int("SCENE_LAYER_WARMUP", 1)  # 1 pre-renders every scene type at start-up
+
+# Threads drawing the slides of one video while the encoder consumes finished ones (0 = inline)
+SLIDE_WORKERS = _env_int("SLIDE_WORKERS", 4)
+
+# Scratch space for each job's narration and unfinished video. Unset uses /dev/shm when it
+# has WORKSPACE_MIN_FREE_MB free, otherwise the system temp directory.
+WORKSPACE_DIR = _env_str("WORKSPACE_DIR", "")
+WORKSPACE_MIN_FREE_MB = _env_int("WORKSPACE_MIN_FREE_MB", 512)
+
+# Finished videos reused for identical (text, language) requests; 0 disables the store
+RESULT_STORE_DIR = _env_str("RESULT_STORE_DIR", "cache/videos")
+RESULT_STORE_MAX_MB = _env_int("RESULT_STORE_MAX_MB", 2048)
+RESULT_STORE_MAX_AGE_SECONDS = _env_int("RESULT_STORE_MAX_AGE_SECONDS", 7 * 24 * 3600)
+
+# Retention for outputs/: artifacts not downloaded or streamed for OUTPUT_TTL_SECONDS are
+# removed, then the least recently used ones while outputs/ exceeds OUTPUT_MAX_MB (0 = no quota)
+OUTPUT_TTL_SECONDS = _env_int("OUTPUT_TTL_SECONDS", 24 * 3600)
+OUTPUT_MAX_MB = _env_int("OUTPUT_MAX_MB", 2048)
+JANITOR_INTERVAL_SECONDS = _env_int("JANITOR_INTERVAL_SECONDS", 300)
+
+# Per-stage latency histograms, cache and queue gauges on /metrics (Prometheus text format);
+# 0 turns recording into no-ops and /metrics returns 404
+METRICS_ENABLED = _env_int("METRICS_ENABLED", 1)
+
+# Debugging: 1 also writes every rendered slide to outputs/ (slides normally stay in memory)
+KEEP_SLIDES = _env_int("KEEP_SLIDES", 0)
+
+# Fonts for slide text. Unset paths are resolved from FONT_DIR, the bundled backend/fonts
+# directory, the system font directories and fontconfig, once per process.
+FONT_DIR = _env_str("FONT_DIR", "")
+FONT_PATH = _env_str("FONT_PATH", "")                        # Latin text
+FONT_PATH_DEVANAGARI = _env_str("FONT_PATH_DEVANAGARI", "")  # Hindi
+FONT_PATH_TAMIL = _env_str("FONT_PATH_TAMIL", "")            # Tamil
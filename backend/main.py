@@ -1,12 +1,28 @@
 import os
-import uuid
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+import re
+import time
+from typing import Literal, Optional
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from services.summarization_service import SummarizationService
+from services.summary_cache import SummaryCache
+from services.inference_sidecar import SidecarSummarizationClient
 from services.tts_service import TTSService
-from services.enhanced_video_service import EnhancedVideoService
+from services.tts_cache import TTSCache
+from services.tts_engines import load_engine
+from services.enhanced_video_service import EnhancedVideoService, RENDERER_VERSION
+from services.job_queue import JobQueue, QueueFullError
+from services.render_pool import RenderPool
+from services.render_profiles import get_profile
+from services.result_store import ResultStore
+from services.workspace import WorkspaceManager
+from services.janitor import OutputJanitor
+from services import metrics
+from services.metrics import REGISTRY, STAGE_SECONDS, SUMMARIZER_GENERATE_SECONDS, SUMMARIZER_TOKENS
+from services.hls_writer import PLAYLIST_NAME
+import config
 
 app = FastAPI(title="AI Video Generator", version="1.0.0")
 
@@ -20,78 +36,424 @@ app.add_middleware(
 )
 
 # Initialize services
-summarization_service = SummarizationService()
-tts_service = TTSService()
-video_service = EnhancedVideoService()
+if config.SUMMARIZER_SOCKET:
+    # Share one model between all workers through the inference sidecar
+    summarization_service = SidecarSummarizationClient(config.SUMMARIZER_SOCKET)
+else:
+    summary_cache = None
+    if config.SUMMARY_CACHE_MAX_MB > 0:
+        summary_cache = SummaryCache(
+            cache_dir=config.SUMMARY_CACHE_DIR,
+            max_memory_entries=config.SUMMARY_CACHE_MEMORY_ENTRIES,
+            max_disk_bytes=config.SUMMARY_CACHE_MAX_MB * 1024 * 1024
+        )
+    summarization_service = SummarizationService(
+        cache=summary_cache,
+        max_batch_size=config.SUMMARY_BATCH_SIZE,
+        max_batch_wait_ms=config.SUMMARY_BATCH_WAIT_MS,
+        backend=config.SUMMARIZER_BACKEND,
+        onnx_cache_dir=config.ONNX_CACHE_DIR,
+        lazy=config.MODEL_LOADING != "eager"
+    )
+tts_cache = None
+if config.TTS_CACHE_MAX_MB > 0:
+    tts_cache = TTSCache(cache_dir=config.TTS_CACHE_DIR, max_bytes=config.TTS_CACHE_MAX_MB * 1024 * 1024)
+tts_service = TTSService(
+    engine=load_engine(config.TTS_ENGINE, config.TTS_VOICE or None),
+    cache=tts_cache,
+    max_workers=config.TTS_WORKERS,
+    max_retries=config.TTS_RETRIES
+)
+# Fail at startup rather than on the first job when RENDER_PROFILE is misspelled
+get_profile(config.RENDER_PROFILE)
+render_pool = None
+if config.RENDER_BACKEND == "process":
+    render_pool = RenderPool(num_workers=config.RENDER_PROCESSES or None)
+video_service = EnhancedVideoService(
+    render_pool=render_pool,
+    layer_cache_size=config.SCENE_LAYER_CACHE_SIZE,
+    # With a render pool the workers draw the slides, so they warm their own layers
+    warm_layers=bool(config.SCENE_LAYER_WARMUP) and render_pool is None,
+    keep_slides=bool(config.KEEP_SLIDES),
+    slide_workers=config.SLIDE_WORKERS
+)
+
+# Per-job scratch directories, on tmpfs when it has room
+workspace_manager = WorkspaceManager(
+    root=config.WORKSPACE_DIR or None,
+    min_free_bytes=config.WORKSPACE_MIN_FREE_MB * 1024 * 1024
+)
+
+# Retention for outputs/: TTL, byte quota and LRU eviction
+janitor = OutputJanitor(
+    output_dir=video_service.output_dir,
+    max_age=config.OUTPUT_TTL_SECONDS,
+    max_bytes=config.OUTPUT_MAX_MB * 1024 * 1024,
+    interval=config.JANITOR_INTERVAL_SECONDS
+)
+
+# Finished videos, reused for identical (text, language) requests
+result_store = None
+if config.RESULT_STORE_MAX_MB > 0:
+    result_store = ResultStore(
+        store_dir=config.RESULT_STORE_DIR,
+        max_bytes=config.RESULT_STORE_MAX_MB * 1024 * 1024,
+        max_age=config.RESULT_STORE_MAX_AGE_SECONDS
+    )
 
 class VideoRequest(BaseModel):
     text: str
     language: str = "en"
+    encoder: Literal["moviepy", "ffmpeg", "hls"] = "moviepy"
+    # Resolution, frame rate and compression; RENDER_PROFILE when not given
+    profile: Optional[Literal["preview", "standard", "archive"]] = None
 
 class VideoResponse(BaseModel):
     video_id: str
     message: str
 
+class JobResponse(BaseModel):
+    job_id: str
+    state: str
+    status_url: str
+
+async def run_video_pipeline(job) -> str:
+    """Summarize, narrate and render a job, reporting each stage on the job"""
+    request = job.params
+    video_id = job.job_id
+    STAGE_SECONDS.observe(time.time() - job.created_at, stage="queued")
+
+    with REGISTRY.timer(STAGE_SECONDS, stage="total"):
+        # Step 1: Summarize the text
+        job.set_state('summarizing')
+        with REGISTRY.timer(STAGE_SECONDS, stage="summarize"):
+            summary = await summarization_service.summarize(request["text"])
+
+        # Narration, temporary audio and the unfinished MP4 stay in the job's own
+        # scratch directory, which is removed whether the job succeeds or fails
+        with workspace_manager.create(video_id) as workspace:
+            # Step 2: Convert summary to speech
+            job.set_state('tts')
+            with REGISTRY.timer(STAGE_SECONDS, stage="tts"):
+                narration = await tts_service.narrate(
+                    summary,
+                    request["language"],
+                    video_id,
+                    work_dir=workspace.path
+                )
+
+            # Step 3: Create video with narration and slides
+            job.set_state('rendering')
+            try:
+                with REGISTRY.timer(STAGE_SECONDS, stage="render"):
+                    video_path = await video_service.create_video(
+                        summary,
+                        narration["audio_path"],
+                        video_id,
+                        encoder=request["encoder"],
+                        narration=narration,
+                        work_dir=workspace.path,
+                        profile=request["profile"]
+                    )
+            finally:
+                # Segments already written stay in outputs/ even when the render fails
+                if request["encoder"] == 'hls':
+                    janitor.register(video_service.stream_dir(video_id))
+    
+    if result_store is not None and job.key is not None:
+        video_path = result_store.put(job.key, video_path)
+        result_store.link(video_id, job.key)
+    
+    # Artifacts left in outputs/ are now subject to retention
+    janitor.register(video_path)
+    return video_path
+
+job_queue = JobQueue(
+    run_video_pipeline,
+    num_workers=config.RENDER_WORKERS,
+    max_queue_size=config.JOB_QUEUE_SIZE,
+    job_ttl=config.JOB_TTL_SECONDS
+)
+
+def collect_gauges() -> list:
+    """Point-in-time values for /metrics, read from the services' stats when scraped"""
+    jobs = job_queue.stats()
+    gauges = [
+        ("video_jobs_queued", "Jobs waiting for a worker", {(): jobs["queued"]}),
+        ("video_jobs_active", "Jobs being processed", {(): jobs["active"]}),
+        ("video_jobs_in_flight", "Distinct inputs queued or rendering", {(): jobs["in_flight"]}),
+        ("video_job_workers", "Job queue workers", {(): jobs["workers"]}),
+    ]
+    
+    hit_rates = {}
+    caches = {
+        "summary": summarization_service.cache_stats(),
+        "tts": tts_service.cache_stats(),
+        "result": result_store.stats() if result_store is not None else None,
+    }
+    for name, stats in caches.items():
+        if stats is not None:
+            hit_rates[(("cache", name),)] = stats["hit_rate"]
+    gauges.append(("cache_hit_rate", "Lifetime hit rate of each cache", hit_rates))
+    
+    # Lifetime generation throughput; rate() over the two raw series gives a windowed one
+    generate_seconds = sum(total for _, total, _ in SUMMARIZER_GENERATE_SECONDS.state().values())
+    tokens = SUMMARIZER_TOKENS.value()
+    gauges.append(("summarizer_tokens_per_second", "Generated tokens per second of model time",
+                   {(): round(tokens / generate_seconds, 2) if generate_seconds else 0.0}))
+    
+    batching = summarization_service.batch_stats()
+    if batching is not None:
+        gauges.append(("summarizer_batch_waiting", "Chunks waiting for the batcher", {(): batching["waiting"]}))
+    if render_pool is not None:
+        gauges.append(("render_pool_in_flight", "Renders running in the process pool",
+                       {(): render_pool.stats()["in_flight"]}))
+    outputs = janitor.stats()
+    gauges.append(("outputs_bytes", "Bytes of indexed artifacts in outputs/", {(): outputs["bytes"]}))
+    return gauges
+
+metrics.configure(bool(config.METRICS_ENABLED))
+REGISTRY.add_collector(collect_gauges)
+
+@app.on_event("startup")
+async def start_background_services():
+    if render_pool is not None:
+        render_pool.start()
+    await job_queue.start()
+    await janitor.start()
+    # Fork the render workers before starting the warm-up thread
+    if config.MODEL_LOADING == "background" or config.SUMMARIZER_SOCKET:
+        summarization_service.start_warmup()
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    await job_queue.stop()
+    await janitor.stop()
+    if render_pool is not None:
+        render_pool.shutdown()
+
+def submit_job(request: VideoRequest):
+    """Validate a request and put it on the job queue"""
+    # Validate input
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text input cannot be empty")
+    
+    if len(request.text) < 50:
+        raise HTTPException(status_code=400, detail="Text must be at least 50 characters long")
+    
+    params = request.model_dump()
+    params["profile"] = request.profile or config.RENDER_PROFILE
+    key = None
+    if result_store is not None:
+        key = result_store.make_key(request.text, request.language, RENDERER_VERSION, video_service.theme,
+                                    params["profile"])
+        
+        # Same input rendered before: answer with the stored video
+        stored_path = result_store.get(key)
+        if stored_path is not None:
+            job = job_queue.add_finished({**params, "cached": True}, stored_path, key)
+            result_store.link(job.job_id, key)
+            return job
+        
+        # Same input rendering right now: wait on that job instead of rendering it twice
+        in_flight = job_queue.find_in_flight(key)
+        if in_flight is not None:
+            result_store.count_coalesced()
+            return in_flight
+    
+    try:
+        return job_queue.submit(params, key)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
 @app.get("/")
 async def root():
     return {"message": "AI Video Generator API", "version": "1.0.0"}
 
+@app.post("/jobs", status_code=202, response_model=JobResponse)
+async def create_job(request: VideoRequest):
+    job = submit_job(request)
+    return JobResponse(job_id=job.job_id, state=job.state, status_url=f"/jobs/{job.job_id}")
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
 @app.post("/generate-video")
 async def generate_video(request: VideoRequest):
-    try:
-        # Validate input
-        if not request.text.strip():
-            raise HTTPException(status_code=400, detail="Text input cannot be empty")
-        
-        if len(request.text) < 50:
-            raise HTTPException(status_code=400, detail="Text must be at least 50 characters long")
-        
-        # Generate unique ID for this video
-        video_id = str(uuid.uuid4())
-        
-        # Step 1: Summarize the text
-        summary = await summarization_service.summarize(request.text)
-        
-        # Step 2: Convert summary to speech
-        audio_path = await tts_service.text_to_speech(
-            summary, 
-            request.language, 
-            video_id
-        )
-        
-        # Step 3: Create video with narration and slides
-        video_path = await video_service.create_video(
-            summary, 
-            audio_path, 
-            video_id
-        )
-        
-        # Return the video file directly
+    job = submit_job(request)
+
+    # Wait for the job while the render workers drain the queue
+    await job.finished.wait()
+    if job.state == 'failed':
+        raise HTTPException(status_code=500, detail=f"Error generating video: {job.error}")
+
+    # Return the video file directly
+    return FileResponse(
+        job.result,
+        media_type="video/mp4",
+        filename=f"ai_video_{job.job_id}.mp4"
+    )
+
+RANGE_CHUNK_SIZE = 256 * 1024
+SEGMENT_NAME_RE = re.compile(r"^seg_\d{4}\.ts$")
+
+# parse_range result for Range headers we don't serve (several ranges, other units)
+RANGE_UNSUPPORTED = "unsupported"
+
+def parse_range(header: str, file_size: int):
+    """Parse a single "bytes=start-end" range.
+
+    Returns (start, end), None when the range can't be satisfied, or
+    RANGE_UNSUPPORTED for headers that should be ignored in favour of the
+    whole file, as RFC 9110 allows.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return RANGE_UNSUPPORTED
+    
+    if match.group(1):
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else file_size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(0, file_size - int(match.group(2)))
+        end = file_size - 1
+    
+    end = min(end, file_size - 1)
+    if start > end:
+        return None
+    return start, end
+
+def iter_file_range(path: str, start: int, end: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+@app.get("/download/{video_id}")
+async def download_video(video_id: str, request: Request):
+    # Stored results live in the result store rather than under the job id
+    job = job_queue.get(video_id)
+    video_path = None
+    if job is not None and job.state == 'done' and job.result:
+        video_path = job.result
+    elif result_store is not None:
+        # The job may have been pruned, or the server restarted, while the video is still stored
+        video_path = result_store.resolve(video_id)
+    if video_path is None:
+        video_path = f"outputs/{video_id}.mp4"
+    
+    if not os.path.exists(video_path):
+        raise HTTPException(status_code=404, detail="Video not found")
+    janitor.touch(video_path)
+    
+    # Byte ranges let players seek without downloading the whole file
+    range_header = request.headers.get("range")
+    file_size = os.path.getsize(video_path)
+    byte_range = parse_range(range_header, file_size) if range_header is not None else RANGE_UNSUPPORTED
+    if byte_range is RANGE_UNSUPPORTED:
         return FileResponse(
             video_path,
             media_type="video/mp4",
-            filename=f"ai_video_{video_id}.mp4"
+            filename=f"ai_video_{video_id}.mp4",
+            headers={"Accept-Ranges": "bytes"}
         )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating video: {str(e)}")
+    
+    if byte_range is None:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+    
+    start, end = byte_range
+    return StreamingResponse(
+        iter_file_range(video_path, start, end),
+        status_code=206,
+        media_type="video/mp4",
+        headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{file_size}",
+            "Content-Length": str(end - start + 1)
+        }
+    )
 
-@app.get("/download/{video_id}")
-async def download_video(video_id: str):
-    video_path = f"outputs/{video_id}.mp4"
+@app.get("/stream/{video_id}/" + PLAYLIST_NAME)
+async def stream_playlist(video_id: str):
+    playlist_path = os.path.join(video_service.stream_dir(video_id), PLAYLIST_NAME)
     
-    if not os.path.exists(video_path):
-        raise HTTPException(status_code=404, detail="Video not found")
+    if not os.path.exists(playlist_path):
+        raise HTTPException(status_code=404, detail="Stream not found")
+    janitor.touch(playlist_path)
     
+    # The playlist grows while the job renders, so players must re-fetch it
     return FileResponse(
-        video_path,
-        media_type="video/mp4",
-        filename=f"ai_video_{video_id}.mp4"
+        playlist_path,
+        media_type="application/vnd.apple.mpegurl",
+        headers={"Cache-Control": "no-cache"}
     )
 
+@app.get("/stream/{video_id}/{segment}")
+async def stream_segment(video_id: str, segment: str):
+    if not SEGMENT_NAME_RE.match(segment):
+        raise HTTPException(status_code=404, detail="Segment not found")
+    
+    segment_path = os.path.join(video_service.stream_dir(video_id), segment)
+    if not os.path.exists(segment_path):
+        raise HTTPException(status_code=404, detail="Segment not found")
+    
+    return FileResponse(segment_path, media_type="video/mp2t")
+
+def is_ready() -> bool:
+    """Whether the API should take traffic.
+
+    In lazy mode the model loads on the first request, so there is nothing to wait for;
+    holding traffic back until it loads would mean it never does.
+    """
+    lazy = config.MODEL_LOADING == "lazy" and not config.SUMMARIZER_SOCKET
+    return lazy or summarization_service.is_ready
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "services": "running"}
+    return {
+        "status": "healthy",
+        "services": "running",
+        "live": True,
+        "ready": is_ready(),
+        "model_loaded": summarization_service.is_ready,
+        "jobs": job_queue.stats(),
+        "summary_cache": summarization_service.cache_stats(),
+        "summary_batching": summarization_service.batch_stats(),
+        "tts_cache": tts_service.cache_stats(),
+        "result_store": result_store.stats() if result_store is not None else None,
+        "outputs": janitor.stats(),
+        "render_pool": render_pool.stats() if render_pool is not None else None
+    }
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    if not REGISTRY.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/health/live")
+async def liveness_check():
+    return {"live": True}
+
+@app.get("/health/ready")
+async def readiness_check():
+    if not is_ready():
+        raise HTTPException(status_code=503, detail="Summarization model is still loading")
+    return {"ready": True}
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,98 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingSummarizer:
+    """Micro-batching front end for a HuggingFace summarization pipeline.
+
+    Chunks submitted from any thread are collected for up to ``max_wait_ms``
+    (or until ``max_batch_size`` are waiting), padded together and run as one
+    batched ``generate`` call. Each caller gets its own result back through a
+    future, so concurrent requests share model passes instead of queueing
+    batch-of-one calls on the same CPU.
+    """
+
+    def __init__(self, summarizer, max_batch_size: int = 8, max_wait_ms: float = 10.0):
+        self.summarizer = summarizer
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue = queue.Queue()
+        self._counts = {"batches": 0, "items": 0, "largest_batch": 0}
+        self._thread = threading.Thread(target=self._run, name="summarizer-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, params: dict) -> Future:
+        """Queue one text for summarization with the given generation parameters"""
+        future = Future()
+        self._queue.put((text, params, future))
+        return future
+
+    def summarize_many(self, texts: list, params: dict) -> list:
+        """Summarize several texts, blocking until all of them are done"""
+        futures = [self.submit(text, params) for text in texts]
+        return [future.result() for future in futures]
+
+    def _collect_batch(self) -> list:
+        """Wait for the first item, then gather more until the batch is full or the window closes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+
+            # Only items with identical generation settings can share a generate call
+            groups = {}
+            for text, params, future in batch:
+                key = json.dumps(params, sort_keys=True)
+                groups.setdefault(key, (params, []))[1].append((text, future))
+
+            for params, items in groups.values():
+                self._run_group(params, items)
+
+    def _run_group(self, params: dict, items: list):
+        texts = [text for text, _ in items]
+        try:
+            results = self.summarizer(
+                texts,
+                batch_size=len(texts),
+                truncation=True,
+                **params
+            )
+            for (_, future), result in zip(items, results):
+                # Pipelines wrap each output in a list for some input shapes
+                if isinstance(result, list):
+                    result = result[0]
+                future.set_result(result['summary_text'])
+        except Exception as e:
+            logger.error(f"Batched summarization of {len(texts)} chunks failed: {e}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+
+        self._counts["batches"] += 1
+        self._counts["items"] += len(texts)
+        self._counts["largest_batch"] = max(self._counts["largest_batch"], len(texts))
+
+    def stats(self) -> dict:
+        batches = self._counts["batches"]
+        return {
+            **self._counts,
+            "mean_batch_size": round(self._counts["items"] / batches, 2) if batches else 0.0,
+            "waiting": self._queue.qsize()
+        }
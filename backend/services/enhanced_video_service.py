@@ -1,146 +1,253 @@
 import os
 import asyncio
+import copy
+import hashlib
+import json
 import random
-from moviepy.editor import (
-    AudioFileClip, ColorClip, CompositeVideoClip, 
-    concatenate_videoclips, ImageClip, VideoClip, TextClip
-)
-from PIL import Image, ImageDraw, ImageFont
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+from moviepy.editor import AudioFileClip, concatenate_videoclips, VideoClip
+from PIL import Image, ImageDraw
+from services.ffmpeg_encoder import encode_frames, x264_options
+from services.hls_writer import HLSWriter
+from services.backgrounds import gradient_image
+from services.lru_cache import MemoryLRUCache
+from services.fonts import get_registry
+from services.text_layout import TextLayoutEngine
+from services.text_chunking import split_sentences
+from services.workspace import JobWorkspace
+from services.metrics import REGISTRY, RENDER_STEP_SECONDS
+from services.render_profiles import encoder_options, get_profile
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever slides or encoding change, so stored results of older renders stop matching
+RENDERER_VERSION = "4"
+
+# Slides are laid out at this resolution; other render profiles scale every coordinate
+DESIGN_SIZE = (1280, 720)
+
+# Color schemes for different scenes, per theme
+THEMES = {
+    'default': {
+        'intro': (41, 128, 185),      # Blue
+        'content': (52, 152, 219),    # Light blue
+        'highlight': (46, 204, 113),  # Green
+        'conclusion': (155, 89, 182), # Purple
+        'neutral': (149, 165, 166)    # Gray
+    }
+}
+
 class EnhancedVideoService:
-    def __init__(self):
+    def __init__(self, render_pool=None, theme: str = 'default', layer_cache_size: int = 16,
+                 warm_layers: bool = False, keep_slides: bool = False, slide_workers: int = 4):
         self.output_dir = "outputs"
+        self.render_pool = render_pool
+        # Threads drawing the slides of one video; 0 draws them inline, one after another
+        self.slide_workers = slide_workers
+        self._slide_executor = None
+        # Slides stay in memory; keep_slides also writes them to outputs/ for debugging
+        self.keep_slides = keep_slides
         os.makedirs(self.output_dir, exist_ok=True)
         
-        # Video settings
-        self.video_size = (1280, 720)  # HD resolution
+        # Video settings; at_size() gives a copy that draws at another resolution
+        self.video_size = DESIGN_SIZE
+        self.scale = 1.0
+        self._sized = {}
         
         # Color schemes for different scenes
-        self.scene_colors = {
-            'intro': (41, 128, 185),      # Blue
-            'content': (52, 152, 219),    # Light blue
-            'highlight': (46, 204, 113),  # Green
-            'conclusion': (155, 89, 182), # Purple
-            'neutral': (149, 165, 166)    # Gray
-        }
+        self.theme = theme
+        self.scene_colors = THEMES[theme]
+        
+        # Word-wrapping with cached word widths
+        self.text_layout = TextLayoutEngine()
+        
+        # Pre-rendered static scene bases, keyed by (scene type, resolution, theme)
+        self._layer_cache = MemoryLRUCache(max_entries=layer_cache_size)
         
         # Character positions and animations
         self.character_positions = [
             (200, 400), (400, 300), (600, 350), (800, 400),
             (300, 500), (500, 450), (700, 500), (900, 450)
         ]
+        
+        if warm_layers:
+            self.warm_up_layers()
     
-    async def create_video(self, summary_text: str, audio_path: str, video_id: str) -> str:
+    async def create_video(self, summary_text: str, audio_path: str, video_id: str,
+                           encoder: str = 'moviepy', narration: dict = None, work_dir: str = None,
+                           profile: str = None) -> str:
         """Create enhanced video with characters, scenes, and animations"""
         try:
+            spec = self.build_render_spec(summary_text, audio_path, video_id, encoder, narration, work_dir,
+                                          profile)
+            if self.render_pool is not None:
+                # Render in a separate process so concurrent videos use separate cores
+                return await self.render_pool.render(spec)
+            
             loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None, 
-                self._create_video_sync, 
-                summary_text, 
-                audio_path, 
-                video_id
-            )
+            return await loop.run_in_executor(None, self.render_spec, spec)
         except Exception as e:
             logger.error(f"Error creating enhanced video: {e}")
             raise
     
-    def _create_character_scene(self, text: str, scene_type: str, filename: str) -> str:
-        """Create a scene with animated characters and visual elements"""
+    def build_render_spec(self, summary_text: str, audio_path: str, video_id: str,
+                          encoder: str = 'moviepy', narration: dict = None, work_dir: str = None,
+                          profile: str = None) -> dict:
+        """Describe a render as a plain, picklable dict"""
+        if narration:
+            # One slide per narrated sentence, shown for exactly as long as it is spoken
+            sentences = list(narration['sentences'])
+        else:
+            # Split summary into sentences
+            sentences = split_sentences(summary_text) or [summary_text]
+        
+        scene_types = self._assign_scene_types(len(sentences))
+        render_profile = get_profile(profile)
+        return {
+            'video_id': video_id,
+            'sentences': sentences,
+            'scene_types': scene_types,
+            'audio_path': os.path.abspath(audio_path),
+            'output_path': os.path.abspath(os.path.join(self.output_dir, f"{video_id}.mp4")),
+            'stream_dir': os.path.abspath(self.stream_dir(video_id)),
+            # The job's scratch directory; without one, render_spec makes a private one
+            'work_dir': os.path.abspath(work_dir) if work_dir else None,
+            'encoder': encoder,
+            'durations': list(narration['durations']) if narration else None,
+            # Resolution, frame rate and x264 settings
+            'profile': render_profile,
+            # Same content, same patterns: renders are reproducible and can be deduplicated
+            'seed': self.content_seed(sentences, scene_types, render_profile['size'])
+        }
+    
+    def content_seed(self, sentences: list, scene_types: list, video_size: tuple = None) -> str:
+        """Seed derived from everything that is drawn, so equal content gives equal frames"""
+        content = json.dumps({
+            'sentences': sentences,
+            'scene_types': scene_types,
+            'theme': self.theme,
+            'video_size': tuple(video_size or self.video_size)
+        }, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def stream_dir(self, video_id: str) -> str:
+        """Directory holding the HLS playlist and segments of a streamed render"""
+        return os.path.join(self.output_dir, f"{video_id}_hls")
+    
+    def at_size(self, size: tuple) -> 'EnhancedVideoService':
+        """This service drawing at another resolution, sharing its caches"""
+        size = tuple(size)
+        if size == self.video_size:
+            return self
+        sized = self._sized.get(size)
+        if sized is None:
+            sized = copy.copy(self)
+            sized.video_size = size
+            sized.scale = size[0] / DESIGN_SIZE[0]
+            sized._sized = {}
+            self._sized[size] = sized
+        return sized
+    
+    def _px(self, value: float) -> int:
+        """A length from the 1280x720 layout, scaled to this service's resolution"""
+        return max(1, int(round(value * self.scale)))
+    
+    def _create_character_scene(self, text: str, scene_type: str, rng: random.Random = None) -> np.ndarray:
+        """Create a scene with animated characters and visual elements as an RGB frame"""
         try:
-            # Create base image
-            img = Image.new('RGB', self.video_size, self.scene_colors[scene_type])
+            # Start from the cached base: gradient, characters, scene elements and border
+            img = self._scene_base(scene_type).copy()
             draw = ImageDraw.Draw(img)
             
-            # Create animated background pattern
-            self._draw_animated_background(draw, scene_type)
-            
-            # Add character elements
-            self._draw_characters(draw, scene_type)
-            
-            # Add visual elements based on scene type
-            self._draw_scene_elements(draw, scene_type)
+            # Create animated background pattern. Every static shape is solid white,
+            # so drawing the white patterns after them gives the same pixels as before
+            self._draw_animated_background(draw, scene_type, rng or random.Random())
             
             # Add text with enhanced styling
             self._draw_enhanced_text(draw, text, scene_type)
             
-            # Add visual effects
+            # Re-stroke the border so it stays on top of long text, as it always has
             self._add_visual_effects(draw, scene_type)
             
-            # Save image
-            image_path = os.path.join(self.output_dir, filename)
-            img.save(image_path, quality=95)
-            return image_path
+            return np.asarray(img)
             
         except Exception as e:
             logger.error(f"Error creating character scene: {e}")
             # Fallback to simple scene
-            return self._create_fallback_scene(text, filename)
-    
-    def _draw_animated_background(self, draw: ImageDraw, scene_type: str):
-        """Draw animated background patterns"""
-        # Create gradient background
-        for y in range(self.video_size[1]):
-            factor = y / self.video_size[1]
-            base_color = self.scene_colors[scene_type]
-            
-            # Create gradient effect
-            r = int(base_color[0] * (1 - factor * 0.2))
-            g = int(base_color[1] * (1 - factor * 0.2))
-            b = int(base_color[2] * (1 - factor * 0.2))
-            
-            draw.line([(0, y), (self.video_size[0], y)], fill=(r, g, b))
-        
+            return self._create_fallback_scene(text)
+    
+    def warm_up_layers(self):
+        """Pre-render the static base of every scene type"""
+        for scene_type in self.scene_colors:
+            self._scene_base(scene_type)
+        logger.info(f"Pre-rendered scene layers for theme {self.theme!r}")
+    
+    def _scene_base(self, scene_type: str) -> Image.Image:
+        """Cached slide background with everything that doesn't depend on the sentence"""
+        key = (scene_type, self.video_size, self.theme)
+        base = self._layer_cache.get(key)
+        if base is None:
+            base = gradient_image(self.scene_colors[scene_type], self.video_size, 0.2)
+            draw = ImageDraw.Draw(base)
+            self._draw_characters(draw, scene_type)
+            self._draw_scene_elements(draw, scene_type)
+            self._add_visual_effects(draw, scene_type)
+            self._layer_cache.put(key, base)
+        return base
+    
+    def _draw_animated_background(self, draw: ImageDraw, scene_type: str, rng: random.Random):
+        """Draw animated background patterns over the gradient"""
         # Add geometric patterns
         if scene_type == 'intro':
-            self._draw_intro_patterns(draw)
+            self._draw_intro_patterns(draw, rng)
         elif scene_type == 'content':
-            self._draw_content_patterns(draw)
+            self._draw_content_patterns(draw, rng)
         elif scene_type == 'highlight':
-            self._draw_highlight_patterns(draw)
+            self._draw_highlight_patterns(draw, rng)
         elif scene_type == 'conclusion':
             self._draw_conclusion_patterns(draw)
     
-    def _draw_intro_patterns(self, draw: ImageDraw):
+    def _draw_intro_patterns(self, draw: ImageDraw, rng: random.Random):
         """Draw introduction scene patterns"""
         # Add floating circles
         for i in range(8):
-            x = random.randint(100, self.video_size[0] - 100)
-            y = random.randint(100, self.video_size[1] - 100)
-            radius = random.randint(20, 60)
+            x = rng.randint(self._px(100), self.video_size[0] - self._px(100))
+            y = rng.randint(self._px(100), self.video_size[1] - self._px(100))
+            radius = rng.randint(self._px(20), self._px(60))
             color = (255, 255, 255, 30)
             draw.ellipse([x-radius, y-radius, x+radius, y+radius], 
                         fill=color, outline=(255, 255, 255, 50))
     
-    def _draw_content_patterns(self, draw: ImageDraw):
+    def _draw_content_patterns(self, draw: ImageDraw, rng: random.Random):
         """Draw content scene patterns"""
         # Add connecting lines
         for i in range(5):
-            x1 = random.randint(50, self.video_size[0] - 50)
-            y1 = random.randint(50, self.video_size[1] - 50)
-            x2 = random.randint(50, self.video_size[0] - 50)
-            y2 = random.randint(50, self.video_size[1] - 50)
-            draw.line([(x1, y1), (x2, y2)], fill=(255, 255, 255, 20), width=2)
+            x1 = rng.randint(self._px(50), self.video_size[0] - self._px(50))
+            y1 = rng.randint(self._px(50), self.video_size[1] - self._px(50))
+            x2 = rng.randint(self._px(50), self.video_size[0] - self._px(50))
+            y2 = rng.randint(self._px(50), self.video_size[1] - self._px(50))
+            draw.line([(x1, y1), (x2, y2)], fill=(255, 255, 255, 20), width=self._px(2))
     
-    def _draw_highlight_patterns(self, draw: ImageDraw):
+    def _draw_highlight_patterns(self, draw: ImageDraw, rng: random.Random):
         """Draw highlight scene patterns"""
         # Add star-like elements
         for i in range(6):
-            x = random.randint(100, self.video_size[0] - 100)
-            y = random.randint(100, self.video_size[1] - 100)
-            self._draw_star(draw, x, y, 15, (255, 255, 255, 40))
+            x = rng.randint(self._px(100), self.video_size[0] - self._px(100))
+            y = rng.randint(self._px(100), self.video_size[1] - self._px(100))
+            self._draw_star(draw, x, y, self._px(15), (255, 255, 255, 40))
     
     def _draw_conclusion_patterns(self, draw: ImageDraw):
         """Draw conclusion scene patterns"""
         # Add wave patterns
         for i in range(3):
-            y_base = 100 + i * 200
-            for x in range(0, self.video_size[0], 20):
-                y = y_base + 20 * (x % 40) / 40
-                draw.ellipse([x-2, y-2, x+2, y+2], fill=(255, 255, 255, 30))
+            y_base = self._px(100 + i * 200)
+            step, period, dot = self._px(20), self._px(40), self._px(2)
+            for x in range(0, self.video_size[0], step):
+                y = y_base + step * (x % period) / period
+                draw.ellipse([x-dot, y-dot, x+dot, y+dot], fill=(255, 255, 255, 30))
     
     def _draw_star(self, draw: ImageDraw, x: int, y: int, size: int, color: tuple):
         """Draw a star shape"""
@@ -159,105 +266,83 @@ class EnhancedVideoService:
         """Draw animated character elements"""
         # Draw character silhouettes
         for i, pos in enumerate(self.character_positions[:4]):
-            x, y = pos
+            x, y = self._px(pos[0]), self._px(pos[1])
             color = (255, 255, 255, 60)
             
             # Draw character body (circle)
-            body_radius = 30
+            body_radius = self._px(30)
             draw.ellipse([x-body_radius, y-body_radius, x+body_radius, y+body_radius], 
                         fill=color, outline=(255, 255, 255, 100))
             
             # Draw character head
-            head_radius = 15
+            head_radius = self._px(15)
             draw.ellipse([x-head_radius, y-body_radius-head_radius, 
                          x+head_radius, y-body_radius+head_radius], 
                         fill=color, outline=(255, 255, 255, 100))
             
             # Draw character arms
-            arm_length = 25
-            draw.line([(x-body_radius, y), (x-body_radius-arm_length, y-10)], 
-                     fill=(255, 255, 255, 100), width=3)
-            draw.line([(x+body_radius, y), (x+body_radius+arm_length, y-10)], 
-                     fill=(255, 255, 255, 100), width=3)
+            arm_length = self._px(25)
+            arm_rise = self._px(10)
+            draw.line([(x-body_radius, y), (x-body_radius-arm_length, y-arm_rise)], 
+                     fill=(255, 255, 255, 100), width=self._px(3))
+            draw.line([(x+body_radius, y), (x+body_radius+arm_length, y-arm_rise)], 
+                     fill=(255, 255, 255, 100), width=self._px(3))
     
     def _draw_scene_elements(self, draw: ImageDraw, scene_type: str):
         """Draw scene-specific visual elements"""
         if scene_type == 'intro':
             # Add title banner
-            banner_y = 80
-            draw.rectangle([(100, banner_y), (self.video_size[0]-100, banner_y+60)], 
+            banner_y = self._px(80)
+            draw.rectangle([(self._px(100), banner_y), (self.video_size[0]-self._px(100), banner_y+self._px(60))], 
                           fill=(255, 255, 255, 20), outline=(255, 255, 255, 50))
             
         elif scene_type == 'content':
             # Add content boxes
             for i in range(3):
-                x = 150 + i * 300
-                y = 150
-                draw.rectangle([(x, y), (x+200, y+100)], 
+                x = self._px(150 + i * 300)
+                y = self._px(150)
+                draw.rectangle([(x, y), (x+self._px(200), y+self._px(100))], 
                               fill=(255, 255, 255, 15), outline=(255, 255, 255, 40))
         
         elif scene_type == 'highlight':
             # Add highlight circles
             for i in range(3):
-                x = 200 + i * 300
-                y = 200
-                draw.ellipse([(x-40, y-40), (x+40, y+40)], 
+                x = self._px(200 + i * 300)
+                y = self._px(200)
+                r = self._px(40)
+                draw.ellipse([(x-r, y-r), (x+r, y+r)], 
                             fill=(255, 255, 255, 25), outline=(255, 255, 255, 60))
         
         elif scene_type == 'conclusion':
             # Add conclusion elements
             center_x = self.video_size[0] // 2
-            center_y = 200
-            draw.ellipse([(center_x-60, center_y-60), (center_x+60, center_y+60)], 
+            center_y = self._px(200)
+            r = self._px(60)
+            draw.ellipse([(center_x-r, center_y-r), (center_x+r, center_y+r)], 
                         fill=(255, 255, 255, 30), outline=(255, 255, 255, 70))
     
     def _draw_enhanced_text(self, draw: ImageDraw, text: str, scene_type: str):
         """Draw text with enhanced styling and effects"""
         try:
-            # Choose font
-            font_size = 48
-            try:
-                font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", font_size)
-            except:
-                try:
-                    font = ImageFont.truetype("arial.ttf", font_size)
-                except:
-                    font = ImageFont.load_default()
-            
-            # Split text into lines
-            words = text.split()
-            lines = []
-            current_line = ""
-            
-            for word in words:
-                test_line = current_line + " " + word if current_line else word
-                bbox = draw.textbbox((0, 0), test_line, font=font)
-                if bbox[2] - bbox[0] < self.video_size[0] - 200:
-                    current_line = test_line
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            
-            if current_line:
-                lines.append(current_line)
-            
-            # Calculate text position
-            line_height = font_size + 15
-            total_height = len(lines) * line_height
-            start_y = (self.video_size[1] - total_height) // 2
+            # Wrap and center the text, shrinking the font if it would overflow the slide
+            layout = self.text_layout.layout(
+                text,
+                (self._px(100), self._px(40), self.video_size[0] - self._px(200), self.video_size[1] - self._px(80)),
+                font_size=self._px(48),
+                min_font_size=self._px(24),
+                line_spacing=self._px(15)
+            )
+            font = layout['font']
+            font_size = layout['font_size']
             
             # Draw text with effects
-            for i, line in enumerate(lines):
-                y_pos = start_y + i * line_height
-                
-                # Calculate x position to center text
-                bbox = draw.textbbox((0, 0), line, font=font)
-                text_width = bbox[2] - bbox[0]
-                x_pos = (self.video_size[0] - text_width) // 2
+            for line_info in layout['lines']:
+                line = line_info['text']
+                x_pos, y_pos = line_info['x'], line_info['y']
+                text_width = line_info['width']
                 
                 # Draw text shadow
-                shadow_offset = 4
+                shadow_offset = self._px(4)
                 draw.text((x_pos + shadow_offset, y_pos + shadow_offset), line, 
                          fill=(0, 0, 0, 100), font=font)
                 
@@ -267,9 +352,9 @@ class EnhancedVideoService:
                 
                 # Add text highlight effect
                 if scene_type == 'highlight':
-                    highlight_y = y_pos + font_size + 5
+                    highlight_y = y_pos + font_size + self._px(5)
                     draw.line([(x_pos, highlight_y), (x_pos + text_width, highlight_y)], 
-                             fill=(255, 255, 255, 80), width=3)
+                             fill=(255, 255, 255, 80), width=self._px(3))
             
         except Exception as e:
             logger.error(f"Error drawing enhanced text: {e}")
@@ -284,143 +369,261 @@ class EnhancedVideoService:
     def _add_visual_effects(self, draw: ImageDraw, scene_type: str):
         """Add final visual effects to the scene"""
         # Add subtle border
-        border_width = 8
+        border_width = self._px(8)
         border_color = (255, 255, 255, 30)
         draw.rectangle([(border_width, border_width), 
                        (self.video_size[0] - border_width, self.video_size[1] - border_width)], 
                       outline=border_color, width=border_width)
         
         # Add corner decorations
-        corner_size = 40
+        corner_size = self._px(40)
         corner_color = (255, 255, 255, 40)
+        inset = self._px(10)
+        width = self._px(3)
         
         # Top-left corner
-        draw.arc([(10, 10), (10 + corner_size, 10 + corner_size)], 0, 90, fill=corner_color, width=3)
+        draw.arc([(inset, inset), (inset + corner_size, inset + corner_size)], 0, 90, fill=corner_color, width=width)
         # Top-right corner
-        draw.arc([(self.video_size[0] - 10 - corner_size, 10), 
-                  (self.video_size[0] - 10, 10 + corner_size)], 90, 180, fill=corner_color, width=3)
+        draw.arc([(self.video_size[0] - inset - corner_size, inset), 
+                  (self.video_size[0] - inset, inset + corner_size)], 90, 180, fill=corner_color, width=width)
         # Bottom-left corner
-        draw.arc([(10, self.video_size[1] - 10 - corner_size), 
-                  (10 + corner_size, self.video_size[1] - 10)], 270, 360, fill=corner_color, width=3)
+        draw.arc([(inset, self.video_size[1] - inset - corner_size), 
+                  (inset + corner_size, self.video_size[1] - inset)], 270, 360, fill=corner_color, width=width)
         # Bottom-right corner
-        draw.arc([(self.video_size[0] - 10 - corner_size, self.video_size[1] - 10 - corner_size), 
-                  (self.video_size[0] - 10, self.video_size[1] - 10)], 180, 270, fill=corner_color, width=3)
+        draw.arc([(self.video_size[0] - inset - corner_size, self.video_size[1] - inset - corner_size), 
+                  (self.video_size[0] - inset, self.video_size[1] - inset)], 180, 270, fill=corner_color, width=width)
     
-    def _create_fallback_scene(self, text: str, filename: str) -> str:
+    def _create_fallback_scene(self, text: str) -> np.ndarray:
         """Create a simple fallback scene if enhanced scene creation fails"""
         img = Image.new('RGB', self.video_size, self.scene_colors['neutral'])
         draw = ImageDraw.Draw(img)
         
         # Simple text
-        try:
-            font = ImageFont.truetype("arial.ttf", 40)
-        except:
-            font = ImageFont.load_default()
+        font_size = self._px(40)
+        font = get_registry().font_for_text(text, font_size)
         
         # Center text
         bbox = draw.textbbox((0, 0), text, font=font)
         text_width = bbox[2] - bbox[0]
         x_pos = (self.video_size[0] - text_width) // 2
-        y_pos = (self.video_size[1] - 40) // 2
+        y_pos = (self.video_size[1] - font_size) // 2
         
         draw.text((x_pos, y_pos), text, fill=(255, 255, 255), font=font)
         
-        image_path = os.path.join(self.output_dir, filename)
-        img.save(image_path)
-        return image_path
+        return np.asarray(img)
+    
+    def _save_debug_slide(self, frame: np.ndarray, video_id: str, index: int):
+        """Write a slide to outputs/ when keep_slides is on"""
+        if self.keep_slides:
+            image_path = os.path.join(self.output_dir, f"{video_id}_scene_{index}.png")
+            Image.fromarray(frame).save(image_path)
+            logger.info(f"Kept slide {image_path}")
     
-    def _create_video_sync(self, summary_text: str, audio_path: str, video_id: str) -> str:
+    def _create_video_sync(self, summary_text: str, audio_path: str, video_id: str,
+                           encoder: str = 'moviepy', narration: dict = None, work_dir: str = None,
+                           profile: str = None) -> str:
         """Create enhanced video with character scenes and animations"""
+        return self.render_spec(self.build_render_spec(summary_text, audio_path, video_id, encoder,
+                                                       narration, work_dir, profile))
+    
+    def render_spec(self, spec: dict) -> str:
+        """Render a video described by build_render_spec"""
         try:
+            video_id = spec['video_id']
+            sentences = spec['sentences']
+            scene_types = spec['scene_types']
+            encoder = spec.get('encoder', 'moviepy')
+            # Specs built before profiles existed render as 'standard'
+            profile = spec.get('profile') or get_profile()
+            
             # Load audio
-            audio = AudioFileClip(audio_path)
+            audio = AudioFileClip(spec['audio_path'])
             total_duration = audio.duration
             
-            # Split summary into sentences
-            sentences = [s.strip() + '.' for s in summary_text.split('.') if s.strip()]
-            if not sentences:
-                sentences = [summary_text]
-            
-            # Determine scene types for each sentence
-            scene_types = self._assign_scene_types(len(sentences))
-            
             # Calculate timing
-            slide_duration = max(4.0, total_duration / len(sentences))
+            if spec.get('durations'):
+                slide_durations = self._narration_durations(spec['durations'], total_duration)
+            else:
+                slide_durations = self._slide_durations(total_duration, len(sentences))
+            if not slide_durations:
+                raise Exception("No video clips were created")
             
-            # Create video clips
-            video_clips = []
-            current_time = 0
+            # Encode into scratch space, then move the finished MP4 into outputs/ atomically
+            work_dir = spec.get('work_dir')
+            workspace = JobWorkspace(video_id, work_dir or tempfile.mkdtemp(prefix=f"{video_id}-"))
+            scratch_path = workspace.file(f"{video_id}.mp4")
             
-            for i, (sentence, scene_type) in enumerate(zip(sentences, scene_types)):
-                # Calculate duration
-                if i == len(sentences) - 1:
-                    duration = total_duration - current_time
+            try:
+                if encoder == 'hls':
+                    audio.close()
+                    self._render_hls(spec, profile, slide_durations, scratch_path)
                 else:
-                    duration = min(slide_duration, total_duration - current_time)
-                
-                if duration <= 0:
-                    break
-                
-                # Create enhanced scene
-                image_filename = f"{video_id}_scene_{i}.png"
-                image_path = self._create_character_scene(sentence, scene_type, image_filename)
-                
-                # Create video clip
-                try:
-                    slide = ImageClip(image_path, duration=duration)
-                    video_clips.append(slide)
-                except Exception as e:
-                    logger.error(f"Error creating scene {i}: {e}")
-                    # Fallback to simple background
-                    background = ColorClip(
-                        size=self.video_size,
-                        color=self.scene_colors[scene_type],
-                        duration=duration
-                    )
-                    video_clips.append(background)
-                
-                current_time += duration
+                    # Draw the scenes in the background; the encoder takes them in order as they finish
+                    slides = self._submit_slides(spec, len(slide_durations))
+                    try:
+                        # Includes waiting for slides that are still drawing, and muxing the narration
+                        with REGISTRY.timer(RENDER_STEP_SECONDS, step="encode", encoder=encoder):
+                            if encoder == 'ffmpeg':
+                                # Raw frames are piped straight into ffmpeg
+                                audio.close()
+                                encode_frames((slide.result() for slide in slides), slide_durations,
+                                              spec['audio_path'], scratch_path, **encoder_options(profile))
+                            else:
+                                temp_audio_path = workspace.file(f"{video_id}_temp-audio.m4a")
+                                self._write_moviepy_video(slides, slide_durations, scene_types, audio,
+                                                          scratch_path, temp_audio_path, profile)
+                    finally:
+                        for slide in slides:
+                            slide.cancel()
                 
-                # Clean up image
-                try:
-                    os.remove(image_path)
-                except:
-                    pass
+                with REGISTRY.timer(RENDER_STEP_SECONDS, step="commit"):
+                    video_path = workspace.commit(f"{video_id}.mp4", spec['output_path'])
+            finally:
+                # A work_dir passed in belongs to the caller
+                if work_dir is None:
+                    workspace.cleanup()
             
-            # Create final video
-            if video_clips:
-                final_video = concatenate_videoclips(video_clips)
-                final_video = final_video.set_audio(audio)
-                
-                # Export
-                video_path = os.path.join(self.output_dir, f"{video_id}.mp4")
-                final_video.write_videofile(
-                    video_path,
-                    fps=24,
-                    codec='libx264',
-                    audio_codec='aac',
-                    temp_audiofile='temp-audio.m4a',
-                    remove_temp=True,
-                    verbose=False,
-                    logger=None,
-                    preset='ultrafast'
-                )
-                
-                # Cleanup
-                final_video.close()
-                audio.close()
-                for clip in video_clips:
-                    clip.close()
-                
-                logger.info(f"Enhanced video saved to {video_path}")
-                return video_path
-            else:
-                raise Exception("No video clips were created")
+            logger.info(f"Enhanced video saved to {video_path}")
+            return video_path
                 
         except Exception as e:
             logger.error(f"Error in enhanced video creation: {e}")
             raise
     
+    def _submit_slides(self, spec: dict, count: int) -> list:
+        """Start drawing the first ``count`` scenes, returning one future per slide in order"""
+        if self.slide_workers <= 0:
+            slides = []
+            for index in range(count):
+                future = Future()
+                future.set_result(self._render_slide(spec, index))
+                slides.append(future)
+            return slides
+        
+        if self._slide_executor is None:
+            # Created on first use, so forked render workers start their own threads
+            self._slide_executor = ThreadPoolExecutor(max_workers=self.slide_workers,
+                                                      thread_name_prefix="slide")
+        return [self._slide_executor.submit(self._render_slide, spec, index) for index in range(count)]
+    
+    def _render_slide(self, spec: dict, index: int) -> np.ndarray:
+        """Draw one scene of a spec, with patterns seeded by (content, scene index)"""
+        size = (spec.get('profile') or get_profile())['size']
+        seed = spec.get('seed') or self.content_seed(spec['sentences'], spec['scene_types'], size)
+        # A private generator per slide, independent of the global random state and of scheduling
+        rng = random.Random(f"{seed}:{index}")
+        with REGISTRY.timer(RENDER_STEP_SECONDS, step="slide"):
+            # Drawn at the profile's resolution rather than drawn large and scaled down
+            slide = self.at_size(size)._create_character_scene(
+                spec['sentences'][index], spec['scene_types'][index], rng
+            )
+        self._save_debug_slide(slide, spec['video_id'], index)
+        return slide
+    
+    def _narration_durations(self, durations: list, total_duration: float) -> list:
+        """Slide durations from the measured narration of each sentence"""
+        # Joined MP3 segments keep each one's encoder padding, so the track runs slightly
+        # longer than the sum; spread the difference so slides stay in step with the voice
+        scale = total_duration / sum(durations) if sum(durations) > 0 else 1.0
+        return [duration * scale for duration in durations]
+    
+    def _slide_durations(self, total_duration: float, num_sentences: int) -> list:
+        """Split the narration into slide durations, at least 4 seconds each"""
+        slide_duration = max(4.0, total_duration / num_sentences)
+        durations = []
+        current_time = 0
+        
+        for i in range(num_sentences):
+            # Calculate duration
+            if i == num_sentences - 1:
+                duration = total_duration - current_time
+            else:
+                duration = min(slide_duration, total_duration - current_time)
+            
+            if duration <= 0:
+                break
+            
+            durations.append(duration)
+            current_time += duration
+        
+        return durations
+    
+    def _render_hls(self, spec: dict, profile: dict, slide_durations: list, video_path: str) -> str:
+        """Encode each scene as an HLS segment as soon as it is drawn, then join them into the MP4"""
+        writer = HLSWriter(spec['stream_dir'], spec['audio_path'], slide_durations, **encoder_options(profile))
+        slides = self._submit_slides(spec, len(slide_durations))
+        
+        try:
+            # Later scenes keep drawing while earlier segments encode
+            for slide, duration in zip(slides, slide_durations):
+                frame = slide.result()
+                with REGISTRY.timer(RENDER_STEP_SECONDS, step="encode", encoder='hls'):
+                    writer.add_slide(frame, duration)
+        finally:
+            for slide in slides:
+                slide.cancel()
+        
+        with REGISTRY.timer(RENDER_STEP_SECONDS, step="concat"):
+            writer.finish(video_path)
+        logger.info(f"Enhanced video streamed to {spec['stream_dir']}")
+        return video_path
+    
+    def _write_moviepy_video(self, slides: list, slide_durations: list, scene_types: list,
+                             audio: AudioFileClip, video_path: str, temp_audio_path: str, profile: dict):
+        """Compose the slide futures with MoviePy and write the final video"""
+        # Create video clips. Each clip waits for its slide only when MoviePy first
+        # asks for a frame, so encoding starts while later slides are still drawing
+        video_clips = []
+        for i, (future, duration) in enumerate(zip(slides, slide_durations)):
+            slide = VideoClip(duration=duration)
+            slide.make_frame = self._slide_frame_maker(future, i, scene_types[i], tuple(profile['size']))
+            slide.size = tuple(profile['size'])
+            video_clips.append(slide)
+        
+        # Create final video
+        final_video = concatenate_videoclips(video_clips)
+        final_video = final_video.set_audio(audio)
+        
+        # Export
+        options = encoder_options(profile)
+        final_video.write_videofile(
+            video_path,
+            fps=options['fps'],
+            codec='libx264',
+            audio_codec='aac',
+            temp_audiofile=temp_audio_path,
+            remove_temp=True,
+            verbose=False,
+            logger=None,
+            preset=options['preset'],
+            ffmpeg_params=x264_options(options['crf'], options['keyint'], options['tune'])
+        )
+        
+        # Cleanup
+        final_video.close()
+        audio.close()
+        for clip in video_clips:
+            clip.close()
+    
+    def _slide_frame_maker(self, future: Future, index: int, scene_type: str, size: tuple):
+        """make_frame for one slide, resolving its future once on the first frame.
+
+        A slide that failed to draw becomes a plain background in its scene's color.
+        """
+        frame = []
+        
+        def make_frame(t):
+            if not frame:
+                try:
+                    frame.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error creating scene {index}: {e}")
+                    # Fallback to simple background
+                    frame.append(np.full((size[1], size[0], 3), self.scene_colors[scene_type], dtype=np.uint8))
+            return frame[0]
+        
+        return make_frame
+    
     def _assign_scene_types(self, num_sentences: int) -> list:
         """Assign scene types to sentences for visual variety"""
         scene_types = []
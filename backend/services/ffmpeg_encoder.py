@@ -0,0 +1,214 @@
+import itertools
+import os
+import subprocess
+import numpy as np
+from moviepy.config import get_setting
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Narration formats the MP4 container can carry as-is
+COPYABLE_AUDIO_EXTENSIONS = ('.mp3', '.m4a', '.aac')
+
+
+class EncoderError(Exception):
+    """Raised when ffmpeg fails to produce the video"""
+    pass
+
+
+def run_ffmpeg(args: list):
+    """Run ffmpeg with the given arguments, raising EncoderError on failure"""
+    command = [get_setting("FFMPEG_BINARY"), '-y', '-loglevel', 'error'] + args
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise EncoderError(f"ffmpeg exited with {result.returncode}: {result.stderr.strip()[-500:]}")
+
+
+def x264_options(crf: int = None, keyint: int = None, tune: str = 'stillimage') -> list:
+    """libx264 quality arguments; anything left as None keeps ffmpeg's default"""
+    args = []
+    if tune:
+        args += ['-tune', tune]
+    if crf is not None:
+        args += ['-crf', str(crf)]
+    if keyint:
+        args += ['-g', str(keyint)]
+    return args
+
+
+def x264_args(preset: str = 'ultrafast', crf: int = None, keyint: int = None,
+              tune: str = 'stillimage') -> list:
+    """ffmpeg output arguments selecting libx264 with the given settings"""
+    return ['-c:v', 'libx264', '-preset', preset] + x264_options(crf, keyint, tune)
+
+
+def raw_frame_input(frame, fps: int) -> list:
+    """ffmpeg input arguments for RGB frames of this frame's size piped on stdin"""
+    height, width = frame.shape[:2]
+    return ['-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{width}x{height}",
+            '-framerate', str(fps), '-i', 'pipe:0']
+
+
+def still_frames_filter(durations: list, fps: int) -> str:
+    """Video filter that shows piped frame i for durations[i] seconds.
+
+    Each slide is piped once, followed by the last slide again to mark where
+    the video ends. setpts moves every frame to the start of its slide and the
+    fps filter repeats it until the next one, like the concat demuxer does.
+    """
+    starts = [0.0]
+    for duration in durations:
+        starts.append(starts[-1] + duration)
+    timestamps = '+'.join(f"{start:.6f}*eq(N,{i})" for i, start in enumerate(starts))
+    return f"setpts='({timestamps})/TB',fps={fps},format=yuv420p"
+
+
+def piped_frames(frames):
+    """The frames to pipe for still_frames_filter: every slide, then the last one again"""
+    last = None
+    for frame in frames:
+        last = frame
+        yield frame
+    if last is not None:
+        yield last
+
+
+def run_ffmpeg_with_frames(args: list, frames: list):
+    """Run ffmpeg reading raw RGB frames from stdin, raising EncoderError on failure"""
+    command = [get_setting("FFMPEG_BINARY"), '-y', '-loglevel', 'error'] + args
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        for frame in frames:
+            process.stdin.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+        process.stdin.close()
+    except BrokenPipeError:
+        # ffmpeg exited early, its stderr says why
+        pass
+    stderr = process.stderr.read().decode('utf-8', errors='replace')
+    returncode = process.wait()
+    if returncode != 0:
+        raise EncoderError(f"ffmpeg exited with {returncode}: {stderr.strip()[-500:]}")
+
+
+def _escape_concat_path(path: str) -> str:
+    """Quote a path for an ffmpeg concat list entry"""
+    return os.path.abspath(path).replace("'", "'\\''")
+
+
+def audio_duration(audio_path: str, sample_rate: int = 48000) -> float:
+    """Exact length of an audio file in seconds, found by decoding it"""
+    # The header of a bare MP3 only gives a bitrate estimate, so count decoded samples instead
+    command = [get_setting("FFMPEG_BINARY"), '-loglevel', 'error', '-i', audio_path,
+               '-f', 's16le', '-ac', '1', '-ar', str(sample_rate), 'pipe:1']
+    result = subprocess.run(command, capture_output=True)
+    if result.returncode != 0:
+        stderr = result.stderr.decode('utf-8', errors='replace')
+        raise EncoderError(f"ffmpeg exited with {result.returncode}: {stderr.strip()[-500:]}")
+    return len(result.stdout) / 2 / sample_rate
+
+
+def concat_audio(segment_paths: list, output_path: str) -> str:
+    """Join audio segments of the same format into one file without re-encoding"""
+    if not segment_paths:
+        raise ValueError("concat_audio needs at least one segment")
+
+    list_path = f"{output_path}.concat.txt"
+    lines = ["ffconcat version 1.0"]
+    for segment_path in segment_paths:
+        lines.append(f"file '{_escape_concat_path(segment_path)}'")
+    with open(list_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+    try:
+        run_ffmpeg(['-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path])
+    finally:
+        if os.path.exists(list_path):
+            os.remove(list_path)
+    return output_path
+
+
+def write_concat_list(image_paths: list, durations: list, list_path: str) -> str:
+    """Write a concat demuxer script that shows each image for its duration"""
+    lines = ["ffconcat version 1.0"]
+    for image_path, duration in zip(image_paths, durations):
+        lines.append(f"file '{_escape_concat_path(image_path)}'")
+        lines.append(f"duration {duration:.6f}")
+    # The demuxer ignores the duration of the final entry unless the file is repeated
+    lines.append(f"file '{_escape_concat_path(image_paths[-1])}'")
+
+    with open(list_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return list_path
+
+
+def encode_slideshow(image_paths: list, durations: list, audio_path: str, output_path: str,
+                     fps: int = 24, preset: str = 'ultrafast', crf: int = None,
+                     keyint: int = None, tune: str = 'stillimage') -> str:
+    """Encode still slides plus narration straight through ffmpeg.
+
+    Each slide is decoded once by the concat demuxer instead of being piped
+    through Python for every output frame, and the narration is copied into
+    the MP4 without re-encoding when its codec allows it.
+    """
+    if not image_paths or len(image_paths) != len(durations):
+        raise ValueError("encode_slideshow needs one duration per slide")
+
+    list_path = f"{output_path}.concat.txt"
+    write_concat_list(image_paths, durations, list_path)
+
+    audio_ext = os.path.splitext(audio_path)[1].lower()
+    audio_codec = 'copy' if audio_ext in COPYABLE_AUDIO_EXTENSIONS else 'aac'
+
+    args = [
+        '-f', 'concat', '-safe', '0', '-i', list_path,
+        '-i', audio_path,
+        '-map', '0:v:0', '-map', '1:a:0',
+        '-vf', f"fps={fps},format=yuv420p",
+        *x264_args(preset, crf, keyint, tune),
+        '-c:a', audio_codec,
+        '-t', f"{sum(durations):.6f}",
+        output_path
+    ]
+
+    try:
+        run_ffmpeg(args)
+        logger.info(f"Slideshow encoded with ffmpeg to {output_path}")
+        return output_path
+    finally:
+        try:
+            os.remove(list_path)
+        except OSError:
+            pass
+
+
+def encode_frames(frames, durations: list, audio_path: str, output_path: str,
+                  fps: int = 24, preset: str = 'ultrafast', crf: int = None,
+                  keyint: int = None, tune: str = 'stillimage') -> str:
+    """Encode in-memory RGB slides plus narration, piping raw frames into ffmpeg.
+
+    Same output as encode_slideshow, without writing the slides to disk and
+    decoding them again. Each slide crosses the pipe once. ``frames`` may be
+    a generator, so slides can still be rendering while ffmpeg encodes the
+    first ones; it must yield one frame per duration.
+    """
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None or not durations:
+        raise ValueError("encode_frames needs at least one slide")
+
+    audio_ext = os.path.splitext(audio_path)[1].lower()
+    audio_codec = 'copy' if audio_ext in COPYABLE_AUDIO_EXTENSIONS else 'aac'
+
+    args = raw_frame_input(first, fps) + [
+        '-i', audio_path,
+        '-map', '0:v:0', '-map', '1:a:0',
+        '-vf', still_frames_filter(durations, fps),
+        *x264_args(preset, crf, keyint, tune),
+        '-c:a', audio_codec,
+        '-t', f"{sum(durations):.6f}",
+        output_path
+    ]
+
+    run_ffmpeg_with_frames(args, piped_frames(itertools.chain([first], frames)))
+    logger.info(f"Slideshow encoded with ffmpeg to {output_path}")
+    return output_path
@@ -0,0 +1,182 @@
+import os
+import shutil
+import subprocess
+import threading
+from functools import lru_cache
+from PIL import ImageFont
+import logging
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fonts")
+
+SYSTEM_FONT_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.local/share/fonts"),
+    os.path.expanduser("~/.fonts"),
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    "C:/Windows/Fonts",
+]
+
+# Unicode blocks of the scripts that need their own font
+SCRIPT_RANGES = {
+    'devanagari': (0x0900, 0x097F),
+    'tamil': (0x0B80, 0x0BFF),
+}
+
+# Scripts of the TTS languages, for callers that know the language but not the text
+LANGUAGE_SCRIPTS = {
+    'en': 'latin',
+    'es': 'latin',
+    'hi': 'devanagari',
+    'ta': 'tamil',
+}
+
+# Font files tried per script, most preferred first (Linux, then macOS, then Windows names)
+FONT_CANDIDATES = {
+    'latin': [
+        "DejaVuSans.ttf", "NotoSans-Regular.ttf", "LiberationSans-Regular.ttf",
+        "Arial.ttf", "arial.ttf", "Helvetica.ttc", "calibri.ttf",
+    ],
+    'devanagari': [
+        "NotoSansDevanagari-Regular.ttf", "Lohit-Devanagari.ttf",
+        "Kohinoor.ttc", "DevanagariMT.ttc", "Nirmala.ttf", "Nirmala.ttc", "mangal.ttf",
+    ],
+    'tamil': [
+        "NotoSansTamil-Regular.ttf", "Lohit-Tamil.ttf",
+        "TamilSangamMN.ttc", "TamilMN.ttc", "Nirmala.ttf", "Nirmala.ttc", "latha.ttf",
+    ],
+}
+
+# fontconfig patterns used when none of the candidates is installed
+FONTCONFIG_PATTERNS = {
+    'latin': "sans-serif",
+    'devanagari': "sans-serif:lang=hi",
+    'tamil': "sans-serif:lang=ta",
+}
+
+
+def detect_script(text: str) -> str:
+    """The first non-Latin script found in the text, or 'latin'"""
+    for char in text:
+        code = ord(char)
+        if code < 0x0900:
+            continue
+        for script, (first, last) in SCRIPT_RANGES.items():
+            if first <= code <= last:
+                return script
+    return 'latin'
+
+
+class FontRegistry:
+    """Resolves a font file per script once per process and memoizes loaded fonts.
+
+    A font file is looked up in this order: the configured path for the
+    script, the bundled backend/fonts directory, the system font directories,
+    then fontconfig. When nothing is found, Pillow's built-in scalable font is
+    used, which only covers Latin text.
+    """
+
+    def __init__(self, font_paths: dict = None, font_dirs: list = None):
+        self.font_paths = {script: path for script, path in (font_paths or {}).items() if path}
+        self.font_dirs = list(font_dirs or []) + [BUNDLED_FONT_DIR] + SYSTEM_FONT_DIRS
+        self._resolved = {}
+        self._file_index = None
+        self._lock = threading.Lock()
+
+    def resolve(self, script: str = 'latin') -> str:
+        """Path of the font used for a script, or None for Pillow's built-in font"""
+        with self._lock:
+            if script not in self._resolved:
+                path = self._find_font(script)
+                if path:
+                    logger.info(f"Using {path} for {script} text")
+                else:
+                    logger.warning(f"No font found for {script} text, falling back to Pillow's default font")
+                self._resolved[script] = path
+            return self._resolved[script]
+
+    def get_font(self, size: int, script: str = 'latin') -> ImageFont.FreeTypeFont:
+        """Font for a script at a pixel size, loaded once per (font, size)"""
+        return _load_font(self.resolve(script), size)
+
+    def font_for_text(self, text: str, size: int, language: str = None) -> ImageFont.FreeTypeFont:
+        """Font that can draw this text, picked from its characters or else the language"""
+        script = detect_script(text)
+        if script == 'latin' and language:
+            script = LANGUAGE_SCRIPTS.get(language, 'latin')
+        return self.get_font(size, script)
+
+    def _find_font(self, script: str) -> str:
+        configured = self.font_paths.get(script)
+        if configured:
+            if os.path.exists(configured):
+                return configured
+            logger.warning(f"Configured {script} font {configured} does not exist")
+
+        index = self._index_font_files()
+        for name in FONT_CANDIDATES.get(script, []):
+            if name.lower() in index:
+                return index[name.lower()]
+
+        return self._fontconfig_match(script)
+
+    def _index_font_files(self) -> dict:
+        """Map lower-cased file names to paths, scanning the font directories once"""
+        if self._file_index is None:
+            index = {}
+            for font_dir in self.font_dirs:
+                for root, _, files in os.walk(font_dir):
+                    for name in files:
+                        # Earlier directories win, so configured and bundled fonts beat system ones
+                        index.setdefault(name.lower(), os.path.join(root, name))
+            self._file_index = index
+        return self._file_index
+
+    def _fontconfig_match(self, script: str) -> str:
+        pattern = FONTCONFIG_PATTERNS.get(script)
+        if not pattern or shutil.which("fc-match") is None:
+            return None
+        try:
+            result = subprocess.run(
+                ["fc-match", "--format=%{file}", pattern],
+                capture_output=True, text=True, timeout=10
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"fc-match failed for {script}: {e}")
+            return None
+        path = result.stdout.strip()
+        return path if result.returncode == 0 and os.path.exists(path) else None
+
+
+@lru_cache(maxsize=64)
+def _load_font(path: str, size: int):
+    if path is None:
+        # Pillow's bundled scalable font
+        return ImageFont.load_default(size=size)
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError as e:
+        logger.error(f"Could not load font {path}: {e}")
+        return ImageFont.load_default(size=size)
+
+
+_registry = None
+
+
+def get_registry() -> FontRegistry:
+    """The process-wide registry, configured from config.py on first use"""
+    global _registry
+    if _registry is None:
+        import config
+        _registry = FontRegistry(
+            font_paths={
+                'latin': config.FONT_PATH,
+                'devanagari': config.FONT_PATH_DEVANAGARI,
+                'tamil': config.FONT_PATH_TAMIL,
+            },
+            font_dirs=[config.FONT_DIR] if config.FONT_DIR else None
+        )
+    return _registry
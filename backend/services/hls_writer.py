@@ -0,0 +1,165 @@
+import math
+import os
+from services.ffmpeg_encoder import (
+    piped_frames, raw_frame_input, run_ffmpeg, run_ffmpeg_with_frames, still_frames_filter, x264_args
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+PLAYLIST_NAME = "index.m3u8"
+
+# The narration is encoded once to AAC; every frame carries 1024 samples
+AAC_SAMPLE_RATE = 44100
+AAC_FRAME_SAMPLES = 1024
+
+
+def segment_name(index: int) -> str:
+    return f"seg_{index:04d}.ts"
+
+
+def split_adts_frames(data: bytes) -> list:
+    """Split an ADTS AAC stream into its frames"""
+    frames = []
+    pos = 0
+    while pos + 7 <= len(data):
+        if data[pos] != 0xFF or (data[pos + 1] & 0xF0) != 0xF0:
+            raise ValueError(f"Lost ADTS sync at byte {pos}")
+        # 13-bit frame length, header included
+        length = ((data[pos + 3] & 0x03) << 11) | (data[pos + 4] << 3) | (data[pos + 5] >> 5)
+        if length < 7:
+            raise ValueError(f"Invalid ADTS frame length {length} at byte {pos}")
+        frames.append(data[pos:pos + length])
+        pos += length
+    return frames
+
+
+class HLSWriter:
+    """Writes a video as HLS segments, one per slide, as the slides are rendered.
+
+    The playlist is rewritten after every segment, so players can start on
+    the first slide while later ones are still being drawn and encoded.
+    ``finish`` closes the playlist and joins the segments into a regular MP4
+    without re-encoding.
+
+    The narration is encoded to AAC once, up front, and each segment gets
+    the next run of whole AAC frames. Encoding every slice separately would
+    give each segment its own encoder priming and padding, heard as a gap
+    of about 60 ms at every slide change. Segments therefore end on AAC
+    frame boundaries, within 12 ms of where the slide was asked to end;
+    the error does not accumulate.
+    """
+
+    def __init__(self, stream_dir: str, audio_path: str, durations: list, fps: int = 24,
+                 preset: str = 'ultrafast', crf: int = None, keyint: int = None, tune: str = 'stillimage'):
+        self.stream_dir = stream_dir
+        self.audio_path = audio_path
+        self.fps = fps
+        self.preset = preset
+        self.crf = crf
+        self.keyint = keyint
+        self.tune = tune
+        # EVENT playlists may not change their target duration, so size it for the longest slide
+        self.target_duration = max(1, math.ceil(max(durations)))
+        self.segments = []
+        self.offset = 0.0
+        self.slide_count = len(durations)
+        self.requested_end = 0.0
+        self.audio_frame_index = 0
+        os.makedirs(self.stream_dir, exist_ok=True)
+        self.audio_frames = self._encode_audio()
+        self._write_playlist(finished=False)
+
+    @property
+    def playlist_path(self) -> str:
+        return os.path.join(self.stream_dir, PLAYLIST_NAME)
+
+    def _encode_audio(self) -> list:
+        """Encode the whole narration to AAC and return its ADTS frames"""
+        track_path = os.path.join(self.stream_dir, "narration.aac")
+        try:
+            run_ffmpeg(['-i', self.audio_path, '-c:a', 'aac', '-ar', str(AAC_SAMPLE_RATE),
+                        '-f', 'adts', track_path])
+            with open(track_path, 'rb') as f:
+                return split_adts_frames(f.read())
+        finally:
+            if os.path.exists(track_path):
+                os.remove(track_path)
+
+    def add_slide(self, frame, duration: float) -> str:
+        """Encode one still RGB frame plus its run of narration frames as the next segment"""
+        index = len(self.segments)
+        name = segment_name(index)
+        segment_path = os.path.join(self.stream_dir, name)
+
+        # End on the AAC frame boundary nearest to where the slide should end;
+        # the last slide takes whatever narration is left
+        self.requested_end += duration
+        start = self.audio_frame_index
+        if index == self.slide_count - 1:
+            end = len(self.audio_frames)
+        else:
+            end = round(self.requested_end * AAC_SAMPLE_RATE / AAC_FRAME_SAMPLES)
+        end = min(len(self.audio_frames), max(start + 1, end))
+        segment_duration = (end - start) * AAC_FRAME_SAMPLES / AAC_SAMPLE_RATE
+
+        audio_path = os.path.join(self.stream_dir, f"seg_{index:04d}.aac")
+        with open(audio_path, 'wb') as f:
+            f.write(b"".join(self.audio_frames[start:end]))
+        try:
+            run_ffmpeg_with_frames(raw_frame_input(frame, self.fps) + [
+                '-f', 'aac', '-i', audio_path,
+                '-map', '0:v:0', '-map', '1:a:0',
+                '-vf', still_frames_filter([segment_duration], self.fps),
+                *x264_args(self.preset, self.crf, self.keyint, self.tune),
+                '-c:a', 'copy',
+                '-t', f"{segment_duration:.6f}",
+                # Keep timestamps continuous across segments
+                '-output_ts_offset', f"{self.offset:.6f}",
+                '-muxdelay', '0',
+                '-f', 'mpegts', segment_path
+            ], piped_frames([frame]))
+        finally:
+            os.remove(audio_path)
+
+        self.audio_frame_index = end
+        self.segments.append((name, segment_duration))
+        self.offset += segment_duration
+        self._write_playlist(finished=False)
+        return segment_path
+
+    def finish(self, output_path: str = None) -> str:
+        """Mark the stream complete and optionally join it into an MP4"""
+        self._write_playlist(finished=True)
+        if output_path is None:
+            return self.playlist_path
+
+        segment_paths = [os.path.join(self.stream_dir, name) for name, _ in self.segments]
+        run_ffmpeg([
+            '-i', 'concat:' + '|'.join(segment_paths),
+            '-c', 'copy', '-bsf:a', 'aac_adtstoasc',
+            '-movflags', '+faststart',
+            output_path
+        ])
+        logger.info(f"Joined {len(segment_paths)} HLS segments into {output_path}")
+        return output_path
+
+    def _write_playlist(self, finished: bool):
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+            f"#EXT-X-TARGETDURATION:{self.target_duration}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+        ]
+        for name, duration in self.segments:
+            lines.append(f"#EXTINF:{duration:.3f},")
+            lines.append(name)
+        if finished:
+            lines.append("#EXT-X-ENDLIST")
+
+        # Replace atomically so readers never see a half-written playlist
+        tmp_path = self.playlist_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.playlist_path)
@@ -0,0 +1,197 @@
+"""Local inference sidecar that hosts one summarization model for many API workers.
+
+Run it next to the API and point the workers at its socket:
+
+    python -m services.inference_sidecar --socket /tmp/ai-video-summarizer.sock
+    SUMMARIZER_SOCKET=/tmp/ai-video-summarizer.sock uvicorn main:app --workers 4
+
+Requests are newline-delimited JSON over a Unix socket, one request per
+connection. Because every worker shares the sidecar's model (and its summary
+cache and micro-batcher), N API workers cost roughly one model's worth of RAM.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from services import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Summaries of long articles are far bigger than asyncio's default 64 KiB line limit
+STREAM_LIMIT = 16 * 1024 * 1024
+
+# Metrics recorded in the sidecar that the API workers report on /metrics
+SHARED_METRICS = (metrics.SUMMARIZER_GENERATE_SECONDS.name, metrics.SUMMARIZER_TOKENS.name)
+
+
+class SidecarSummarizationClient:
+    """Drop-in replacement for SummarizationService that calls the sidecar"""
+
+    def __init__(self, socket_path: str, connect_timeout: float = 30.0, poll_interval: float = 5.0):
+        self.socket_path = socket_path
+        self.connect_timeout = connect_timeout
+        self.poll_interval = poll_interval
+        self._stats = {}
+        self._poller = None
+        # Last cumulative metrics seen from the sidecar, and from which sidecar process
+        self._sidecar_metrics = {}
+        self._sidecar_pid = None
+
+    @property
+    def is_ready(self) -> bool:
+        return bool(self._stats.get("ready"))
+
+    def cache_stats(self) -> dict:
+        return self._stats.get("summary_cache")
+
+    def batch_stats(self) -> dict:
+        return self._stats.get("summary_batching")
+
+    def start_warmup(self):
+        """Start polling the sidecar for readiness and stats"""
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll_stats())
+
+    async def _poll_stats(self):
+        while True:
+            try:
+                self._stats = await self._call({"op": "stats"}, wait_for_socket=False)
+                self._merge_metrics(self._stats)
+            except Exception as e:
+                self._stats = {}
+                logger.warning(f"Inference sidecar unavailable: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def _merge_metrics(self, stats: dict):
+        """Add the sidecar's summarizer observations since the last poll to this process's metrics"""
+        current = metrics.load_export(stats.get("metrics"))
+        # A restarted sidecar counts from zero again
+        previous = self._sidecar_metrics if stats.get("pid") == self._sidecar_pid else {}
+        metrics.REGISTRY.merge(metrics.state_delta(current, previous))
+        self._sidecar_metrics = current
+        self._sidecar_pid = stats.get("pid")
+
+    async def summarize(self, text: str) -> str:
+        """Summarize the input text in the sidecar"""
+        try:
+            response = await self._call({"op": "summarize", "text": text})
+            return response["summary"]
+        except Exception as e:
+            logger.error(f"Error in sidecar summarization: {e}")
+            raise
+
+    async def _call(self, request: dict, wait_for_socket: bool = True) -> dict:
+        reader, writer = await self._connect(wait_for_socket)
+        try:
+            writer.write(json.dumps(request).encode("utf-8") + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+        finally:
+            writer.close()
+
+        if not line:
+            raise ConnectionError("Inference sidecar closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    async def _connect(self, wait_for_socket: bool):
+        """Open a connection, waiting for the sidecar to come up if needed"""
+        deadline = time.monotonic() + (self.connect_timeout if wait_for_socket else 0)
+        while True:
+            try:
+                return await asyncio.open_unix_connection(self.socket_path, limit=STREAM_LIMIT)
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() >= deadline:
+                    raise
+                await asyncio.sleep(0.5)
+
+
+class InferenceSidecar:
+    """Serves a SummarizationService over a Unix socket"""
+
+    def __init__(self, service, socket_path: str):
+        self.service = service
+        self.socket_path = socket_path
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=STREAM_LIMIT)
+        os.chmod(self.socket_path, 0o660)
+        logger.info(f"Inference sidecar listening on {self.socket_path}")
+
+        # Accept connections right away; summarize requests wait for the model
+        self.service.start_warmup()
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            response = await self._dispatch(request)
+        except Exception as e:
+            logger.error(f"Sidecar request failed: {e}")
+            response = {"error": str(e)}
+
+        try:
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "summarize":
+            return {"summary": await self.service.summarize(request["text"])}
+        if op == "stats":
+            return {
+                "ready": self.service.is_ready,
+                "pid": os.getpid(),
+                "summary_cache": self.service.cache_stats(),
+                "summary_batching": self.service.batch_stats(),
+                # Cumulative, so every API worker polling the sidecar sees all of it
+                "metrics": metrics.REGISTRY.export(SHARED_METRICS)
+            }
+        raise ValueError(f"Unknown sidecar operation: {op!r}")
+
+
+def main():
+    import config
+    from services.summarization_service import SummarizationService
+    from services.summary_cache import SummaryCache
+
+    parser = argparse.ArgumentParser(description="Host the summarization model for local API workers")
+    parser.add_argument("--socket", default=config.SUMMARIZER_SOCKET or "/tmp/ai-video-summarizer.sock")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    metrics.configure(bool(config.METRICS_ENABLED))
+
+    summary_cache = None
+    if config.SUMMARY_CACHE_MAX_MB > 0:
+        summary_cache = SummaryCache(
+            cache_dir=config.SUMMARY_CACHE_DIR,
+            max_memory_entries=config.SUMMARY_CACHE_MEMORY_ENTRIES,
+            max_disk_bytes=config.SUMMARY_CACHE_MAX_MB * 1024 * 1024
+        )
+    service = SummarizationService(
+        cache=summary_cache,
+        max_batch_size=config.SUMMARY_BATCH_SIZE,
+        max_batch_wait_ms=config.SUMMARY_BATCH_WAIT_MS,
+        backend=config.SUMMARIZER_BACKEND,
+        onnx_cache_dir=config.ONNX_CACHE_DIR,
+        lazy=True
+    )
+
+    asyncio.run(InferenceSidecar(service, args.socket).serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _entry_size(path: str) -> int:
+    """Bytes used by a file, or by every file under a directory"""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class OutputJanitor:
+    """Background retention for the artifacts in ``outputs/``.
+
+    Every top-level entry (a video, an HLS directory, a debug slide) is kept
+    in an index of size and last access, least recently used first. The
+    pipeline registers new artifacts and the download routes touch them.
+    The directory is scanned at start-up and again before every sweep, to
+    pick up entries nobody registered (debug slides written by render
+    workers, anything left by a crash); only entries missing from the index
+    are measured. Each sweep removes entries not accessed within ``max_age``
+    seconds, then the least recently used ones until the total is under
+    ``max_bytes``.
+    """
+
+    def __init__(self, output_dir: str = "outputs", max_age: int = 24 * 3600,
+                 max_bytes: int = 0, interval: int = 300):
+        self.output_dir = os.path.abspath(output_dir)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.interval = max(1, interval)
+        self._index = OrderedDict()  # entry name -> [size, last access]
+        self._total_bytes = 0
+        self._removed = {"expired": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._task = None
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        """Index what is on disk but not yet in the index, keeping it in access order"""
+        with self._lock:
+            known = set(self._index)
+        entries = []
+        for entry in os.scandir(self.output_dir):
+            if entry.name in known:
+                continue
+            try:
+                stat = entry.stat()
+                # atime is not updated on noatime mounts
+                accessed = max(stat.st_atime, stat.st_mtime)
+                entries.append((accessed, entry.name, _entry_size(entry.path)))
+            except OSError:
+                continue
+        with self._lock:
+            newest = next(reversed(self._index.values()))[1] if self._index else 0.0
+            for accessed, name, size in sorted(entries):
+                if name in self._index:
+                    # Registered since the directory was listed
+                    continue
+                self._index[name] = [size, accessed]
+                self._total_bytes += size
+            if entries and min(entries)[0] < newest:
+                # Sweeps rely on the least recently used entries coming first
+                self._index = OrderedDict(sorted(self._index.items(), key=lambda item: item[1][1]))
+
+    def _entry_name(self, path: str):
+        """Top-level entry of outputs/ that a path belongs to, or None if it is elsewhere"""
+        relative = os.path.relpath(os.path.abspath(path), self.output_dir)
+        if relative.startswith(os.pardir) or relative == os.curdir:
+            return None
+        return relative.split(os.sep, 1)[0]
+
+    def register(self, path: str):
+        """Index a finished artifact"""
+        name = self._entry_name(path)
+        if name is None or not os.path.exists(path):
+            return
+        size = _entry_size(os.path.join(self.output_dir, name))
+        with self._lock:
+            self._total_bytes -= self._index.pop(name, [0])[0]
+            self._index[name] = [size, time.time()]
+            self._total_bytes += size
+
+    def touch(self, path: str):
+        """Record an access, moving the artifact to the back of the eviction order"""
+        name = self._entry_name(path)
+        with self._lock:
+            entry = self._index.get(name)
+            if entry is not None:
+                entry[1] = time.time()
+                self._index.move_to_end(name)
+
+    def sweep(self):
+        """Remove expired entries, then least recently used ones over the byte quota"""
+        self._scan()
+        if self.max_age > 0:
+            cutoff = time.time() - self.max_age
+            with self._lock:
+                # Accesses only ever move entries to the end, so the expired ones lead the index
+                expired = []
+                for name, (_, accessed) in self._index.items():
+                    if accessed >= cutoff:
+                        break
+                    expired.append(name)
+            for name in expired:
+                self._remove(name, "expired")
+
+        if self.max_bytes > 0:
+            while True:
+                with self._lock:
+                    if self._total_bytes <= self.max_bytes or not self._index:
+                        break
+                    name = next(iter(self._index))
+                self._remove(name, "evicted")
+
+    def _remove(self, name: str, reason: str):
+        path = os.path.join(self.output_dir, name)
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove {path}: {e}")
+        with self._lock:
+            self._total_bytes -= self._index.pop(name, [0])[0]
+            self._removed[reason] += 1
+        logger.info(f"Removed {name} from {self.output_dir} ({reason})")
+
+    async def start(self):
+        """Start sweeping on the running loop every ``interval`` seconds"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await loop.run_in_executor(None, self.sweep)
+            except Exception as e:
+                logger.error(f"Output sweep failed: {e}")
+
+    def stats(self) -> dict:
+        """Indexed artifacts, their size and what has been removed"""
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "removed": dict(self._removed)
+            }
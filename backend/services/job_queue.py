@@ -0,0 +1,180 @@
+import asyncio
+import time
+import uuid
+from services.metrics import JOBS_FINISHED
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle states, in pipeline order
+JOB_STATES = ('queued', 'summarizing', 'tts', 'rendering', 'done', 'failed')
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+    pass
+
+
+class Job:
+    """A single video generation request tracked by the job queue"""
+
+    def __init__(self, job_id: str, params: dict, key: str = None):
+        self.job_id = job_id
+        self.params = params
+        # Content key of the result, shared by identical requests
+        self.key = key
+        self.state = 'queued'
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.finished = asyncio.Event()
+
+    def set_state(self, state: str):
+        """Move the job to a new pipeline state"""
+        if state not in JOB_STATES:
+            raise ValueError(f"Unknown job state: {state}")
+        self.state = state
+        self.updated_at = time.time()
+        logger.info(f"Job {self.job_id} -> {state}")
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in ('done', 'failed')
+
+    def to_dict(self) -> dict:
+        """Public view of the job for the status endpoint"""
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "download_url": f"/download/{self.job_id}" if self.state == 'done' else None,
+            # Streamed renders can be watched while the later slides are still encoding;
+            # videos answered from the result store were never segmented under this id
+            "stream_url": (f"/stream/{self.job_id}/index.m3u8"
+                           if self.params.get("encoder") == 'hls' and self.state in ('rendering', 'done')
+                           and not self.params.get("cached")
+                           else None),
+            "cached": bool(self.params.get("cached"))
+        }
+
+
+class JobQueue:
+    """Bounded queue of video jobs drained by a fixed pool of render workers.
+
+    ``handler`` is an async callable that receives the ``Job`` and returns the
+    path of the finished video. Workers update the job state around it.
+    Jobs submitted with a ``key`` are single-flight: while one is queued or
+    running, identical submissions get the same job back.
+    """
+
+    def __init__(self, handler, num_workers: int = 2, max_queue_size: int = 16, job_ttl: int = 3600):
+        self.handler = handler
+        self.num_workers = max(1, num_workers)
+        self.max_queue_size = max(1, max_queue_size)
+        self.job_ttl = job_ttl
+        self.jobs = {}
+        self._in_flight = {}  # key -> unfinished job
+        self._queue = None
+        self._workers = []
+        self._active = 0
+
+    async def start(self):
+        """Create the queue and spawn the worker tasks on the running loop"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.num_workers)
+        ]
+        logger.info(f"Job queue started with {self.num_workers} workers (capacity {self.max_queue_size})")
+
+    async def stop(self):
+        """Cancel the worker tasks"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, params: dict, key: str = None) -> Job:
+        """Enqueue a new job, raising QueueFullError when at capacity"""
+        if self._queue is None:
+            raise RuntimeError("Job queue has not been started")
+
+        self._prune_finished()
+
+        job = Job(str(uuid.uuid4()), params, key)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.max_queue_size} jobs waiting)")
+
+        self.jobs[job.job_id] = job
+        if key is not None:
+            self._in_flight[key] = job
+        return job
+
+    def find_in_flight(self, key: str):
+        """The queued or running job with this key, if any"""
+        return self._in_flight.get(key)
+
+    def add_finished(self, params: dict, result: str, key: str = None) -> Job:
+        """Record a job whose result already exists, without queueing any work"""
+        self._prune_finished()
+
+        job = Job(str(uuid.uuid4()), params, key)
+        job.result = result
+        job.set_state('done')
+        job.finished.set()
+        self.jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str):
+        """Look up a job by id"""
+        return self.jobs.get(job_id)
+
+    def stats(self) -> dict:
+        """Queue depth and worker utilisation"""
+        return {
+            "workers": self.num_workers,
+            "active": self._active,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_flight": len(self._in_flight),
+            "capacity": self.max_queue_size
+        }
+
+    async def _worker(self, index: int):
+        """Pull jobs off the queue and run them through the handler"""
+        while True:
+            job = await self._queue.get()
+            self._active += 1
+            try:
+                job.result = await self.handler(job)
+                job.set_state('done')
+            except asyncio.CancelledError:
+                job.error = "Job cancelled"
+                job.set_state('failed')
+                raise
+            except Exception as e:
+                logger.error(f"Worker {index} failed job {job.job_id}: {e}")
+                job.error = str(e)
+                job.set_state('failed')
+            finally:
+                self._active -= 1
+                if job.key is not None and self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+                JOBS_FINISHED.inc(state=job.state)
+                job.finished.set()
+                self._queue.task_done()
+
+    def _prune_finished(self):
+        """Forget finished jobs older than the configured TTL"""
+        cutoff = time.time() - self.job_ttl
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.is_finished and job.updated_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
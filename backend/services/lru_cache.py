@@ -0,0 +1,180 @@
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryLRUCache:
+    """Thread-safe in-memory LRU map with a maximum number of entries"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(0, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: str, value):
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskLRUCache:
+    """Byte-valued cache stored as one file per key, evicted by total size.
+
+    An in-memory index of (size, last access) is built once at start-up so
+    eviction never needs to rescan the directory.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, suffix: str = ".bin"):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._index = OrderedDict()  # key -> size, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.suffix)
+
+    def _load_index(self):
+        """Index the files already on disk, oldest access first"""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(self.suffix):
+                    stat = entry.stat()
+                    entries.append((stat.st_atime, entry.name[:-len(self.suffix)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str):
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        try:
+            path = self._path(key)
+            with open(path, 'rb') as f:
+                data = f.read()
+            now = time.time()
+            os.utime(path, (now, now))
+            return data
+        except OSError:
+            with self._lock:
+                self._total_bytes -= self._index.pop(key, 0)
+            return None
+
+    def put(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def get_path(self, key: str):
+        """Path of a cached file, marking it as recently used, or None"""
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        path = self._path(key)
+        try:
+            now = time.time()
+            os.utime(path, (now, now))
+            return path
+        except OSError:
+            with self._lock:
+                self._total_bytes -= self._index.pop(key, 0)
+            return None
+
+    def put_file(self, key: str, source_path: str):
+        """Move a file into the cache and return its new path, or None if it is too big"""
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            return None
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            # shutil.move copies across filesystems; the rename makes the entry appear atomically
+            shutil.move(source_path, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not store cache entry {key}: {e}")
+            return None
+
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+            self._index[key] = size
+            self._total_bytes += size
+            self._evict()
+        return path
+
+    def expire(self, max_age: float) -> int:
+        """Remove entries not used within ``max_age`` seconds, returning how many were removed"""
+        cutoff = time.time() - max_age
+        with self._lock:
+            keys = list(self._index)
+        removed = 0
+        # The index is least recently used first, so stop at the first fresh entry
+        for key in keys:
+            path = self._path(key)
+            try:
+                if os.stat(path).st_mtime >= cutoff:
+                    break
+                os.remove(path)
+            except OSError:
+                pass
+            with self._lock:
+                self._total_bytes -= self._index.pop(key, 0)
+            removed += 1
+        return removed
+
+    def _evict(self):
+        """Drop least recently used files until under the size limit"""
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
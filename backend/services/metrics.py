@@ -0,0 +1,260 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from a single slide up to a long render
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in sorted(labels.items())
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float) and value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, one series per label set"""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS, registry=None):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._registry = registry
+        self._series = {}  # sorted label items -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        if self._registry is not None and not self._registry.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def state(self) -> dict:
+        with self._lock:
+            return {key: [list(counts), total, count] for key, (counts, total, count) in self._series.items()}
+
+    def merge(self, state: dict):
+        """Add observations recorded elsewhere (e.g. in a render worker process)"""
+        with self._lock:
+            for key, (counts, total, count) in state.items():
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+                for i, n in enumerate(counts):
+                    series[0][i] += n
+                series[1] += total
+                series[2] += count
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.state().items()):
+            labels = dict(key)
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': bound})} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter, one series per label set"""
+
+    def __init__(self, name: str, help_text: str, registry=None):
+        self.name = name
+        self.help = help_text
+        self._registry = registry
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if self._registry is not None and not self._registry.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def state(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, state: dict):
+        with self._lock:
+            for key, amount in state.items():
+                self._values[key] = self._values.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.state().items()):
+            lines.append(f"{self.name}{_format_labels(dict(key))} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered in the Prometheus text format.
+
+    Histograms and counters are updated as work happens. Gauges (queue
+    depth, cache hit rates, ...) are read from collector callbacks only when
+    /metrics is scraped, so they cost nothing in between. With the registry
+    disabled, ``timer`` returns a shared no-op context and nothing is recorded.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics = {}
+        self._collectors = []
+
+    def histogram(self, name: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, help_text, buckets, self)
+        return self._metrics[name]
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, help_text, self)
+        return self._metrics[name]
+
+    def add_collector(self, collector):
+        """Register a callable returning ``(name, help, {labels tuple: value})`` gauges at scrape time"""
+        self._collectors.append(collector)
+
+    def timer(self, histogram: Histogram, **labels):
+        """Context manager observing the wall time of its block"""
+        if not self.enabled:
+            return nullcontext()
+        return self._time(histogram, labels)
+
+    @contextmanager
+    def _time(self, histogram: Histogram, labels: dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - start, **labels)
+
+    def drain(self) -> dict:
+        """Snapshot and reset every histogram and counter, for shipping to another process"""
+        snapshot = {}
+        for name, metric in self._metrics.items():
+            state = metric.state()
+            if state:
+                snapshot[name] = state
+                metric.reset()
+        return snapshot
+
+    def merge(self, snapshot: dict):
+        """Fold in a snapshot taken by drain() in another process"""
+        for name, state in (snapshot or {}).items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(state)
+
+    def export(self, names: list) -> dict:
+        """JSON-safe copy of some metrics' state, without resetting them (see load_export)"""
+        exported = {}
+        for name in names:
+            metric = self._metrics.get(name)
+            if metric is not None:
+                exported[name] = [[[list(pair) for pair in key], value] for key, value in metric.state().items()]
+        return exported
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                gauges = collector()
+            except Exception as e:
+                logger.error(f"Metrics collector failed: {e}")
+                continue
+            for name, help_text, samples in gauges:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                for key, value in sorted(samples.items()):
+                    lines.append(f"{name}{_format_labels(dict(key))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Stage latencies shared by the pipeline and the services
+STAGE_SECONDS = REGISTRY.histogram(
+    "video_stage_seconds", "Wall time of each pipeline stage (summarize, tts, render, total)")
+RENDER_STEP_SECONDS = REGISTRY.histogram(
+    "video_render_step_seconds", "Wall time of the steps inside a render (slide, encode, concat)")
+TTS_SENTENCE_SECONDS = REGISTRY.histogram(
+    "tts_sentence_seconds", "Time to narrate one sentence, by engine and cache result")
+SUMMARIZER_GENERATE_SECONDS = REGISTRY.histogram(
+    "summarizer_generate_seconds", "Time of one model generation call over a batch of chunks")
+SUMMARIZER_TOKENS = REGISTRY.counter(
+    "summarizer_generated_tokens_total", "Tokens generated by the summarization model")
+JOBS_FINISHED = REGISTRY.counter(
+    "video_jobs_finished_total", "Jobs that finished, by final state")
+
+
+def load_export(exported: dict) -> dict:
+    """Turn the output of MetricsRegistry.export back into drain()/merge() form"""
+    return {
+        name: {tuple(tuple(pair) for pair in key): value for key, value in series}
+        for name, series in (exported or {}).items()
+    }
+
+
+def state_delta(current: dict, previous: dict) -> dict:
+    """Observations in one cumulative snapshot that were not in an earlier one"""
+    delta = {}
+    for name, series in current.items():
+        before = previous.get(name, {})
+        changes = {}
+        for key, value in series.items():
+            old = before.get(key)
+            if old is None:
+                changes[key] = value
+            elif isinstance(value, list):
+                # Histogram series: [bucket counts, sum, count]
+                changes[key] = [[a - b for a, b in zip(value[0], old[0])], value[1] - old[1], value[2] - old[2]]
+            else:
+                changes[key] = value - old
+        delta[name] = changes
+    return delta
+
+
+def configure(enabled: bool):
+    REGISTRY.enabled = enabled
@@ -0,0 +1,101 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from services import metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Video service owned by each worker process, created once by the initializer
+_worker_service = None
+
+
+def _warm_start_worker():
+    """Build the worker's video service once so renders skip the setup cost"""
+    global _worker_service
+    import config
+    from services.enhanced_video_service import EnhancedVideoService
+    metrics.configure(bool(config.METRICS_ENABLED))
+    # Forked workers inherit the parent's observations; only report their own
+    metrics.REGISTRY.drain()
+    _worker_service = EnhancedVideoService(
+        layer_cache_size=config.SCENE_LAYER_CACHE_SIZE,
+        warm_layers=bool(config.SCENE_LAYER_WARMUP),
+        keep_slides=bool(config.KEEP_SLIDES),
+        # The pool already runs a worker per core; one drawing thread is enough to overlap
+        # slides with encoding without oversubscribing the CPU
+        slide_workers=min(config.SLIDE_WORKERS, 1)
+    )
+    logger.info(f"Render worker {os.getpid()} ready")
+
+
+def _render_in_worker(spec: dict) -> tuple:
+    """Entry point executed inside a worker process; returns the video path and the render's metrics"""
+    if _worker_service is None:
+        _warm_start_worker()
+    try:
+        return _worker_service.render_spec(spec), metrics.REGISTRY.drain()
+    except Exception as e:
+        # Failed renders still report their step timings
+        e.metrics = metrics.REGISTRY.drain()
+        raise
+
+
+def _ping(_=None) -> int:
+    return os.getpid()
+
+
+class RenderPool:
+    """Process pool that renders EnhancedVideoService specs on separate cores"""
+
+    def __init__(self, num_workers: int = None, start_method: str = None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.start_method = start_method
+        self._executor = None
+        self._in_flight = 0
+
+    def start(self):
+        """Start the worker processes and wait until each one is warm"""
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_warm_start_worker
+        )
+        # Make the pool launch its workers now so the first real render doesn't pay for it
+        list(self._executor.map(_ping, range(self.num_workers)))
+        logger.info(f"Render pool started with {self.num_workers} {self.start_method} workers")
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def render(self, spec: dict) -> str:
+        """Render a spec in the pool without blocking the event loop"""
+        if self._executor is None:
+            self.start()
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_event_loop()
+            video_path, snapshot = await loop.run_in_executor(self._executor, _render_in_worker, spec)
+            # Step timings were recorded in the worker process
+            metrics.REGISTRY.merge(snapshot)
+            return video_path
+        except Exception as e:
+            metrics.REGISTRY.merge(getattr(e, 'metrics', None))
+            raise
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.num_workers,
+            "start_method": self.start_method,
+            "in_flight": self._in_flight
+        }
@@ -0,0 +1,59 @@
+DEFAULT_PROFILE = 'standard'
+
+# Output settings a request can pick. Slides are still images, so x264 runs with
+# tune=stillimage and the keyframe interval only matters within long slides
+# (every slide change is a scene cut and gets a keyframe anyway).
+PROFILES = {
+    # Quick look on a phone: a quarter of the pixels to draw and an eighth of the frames to
+    # encode, which leaves time for a slower preset that halves the file again.
+    # Slide changes land within half a frame (~80 ms) of the narration.
+    'preview': {
+        'size': (640, 360),
+        'fps': 6,
+        'crf': 30,
+        'preset': 'veryfast',
+        'keyint_seconds': 4,
+        'tune': 'stillimage'
+    },
+    # What every render used before profiles existed
+    'standard': {
+        'size': (1280, 720),
+        'fps': 24,
+        'crf': 23,
+        'preset': 'ultrafast',
+        'keyint_seconds': None,  # x264's default
+        'tune': 'stillimage'
+    },
+    # Long-term storage: same picture in about a quarter of the bytes. The time x264 spends
+    # grows with the number of frames, so halving the frame rate pays for the slow preset
+    'archive': {
+        'size': (1280, 720),
+        'fps': 12,
+        'crf': 28,
+        'preset': 'slow',
+        'keyint_seconds': 20,
+        'tune': 'stillimage'
+    }
+}
+
+
+def get_profile(name: str = None) -> dict:
+    """Settings of a named profile (the default when None), including its name"""
+    name = name or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown render profile {name!r}, expected one of: {', '.join(PROFILES)}")
+    return {'name': name, **PROFILES[name]}
+
+
+def encoder_options(profile: dict) -> dict:
+    """Keyword arguments for encode_frames, encode_slideshow and HLSWriter"""
+    keyint = None
+    if profile.get('keyint_seconds'):
+        keyint = max(1, round(profile['fps'] * profile['keyint_seconds']))
+    return {
+        'fps': profile['fps'],
+        'preset': profile['preset'],
+        'crf': profile.get('crf'),
+        'keyint': keyint,
+        'tune': profile.get('tune')
+    }
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from services.lru_cache import DiskLRUCache
+from services.summary_cache import normalize_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_ID_RE = re.compile(r"^[0-9a-f-]+$")
+
+
+class ResultStore:
+    """Content-addressed store of finished videos.
+
+    Videos are keyed on the normalized input text, narration language,
+    renderer version, theme and render profile, so a repeated request can be answered with
+    the MP4 rendered the first time. Entries are evicted least recently used
+    first once the store exceeds ``max_bytes``, and after ``max_age``
+    seconds without being requested.
+
+    Each job that produced or was answered with a stored video gets a small
+    alias file under ``jobs/`` naming its key, so ``/download/{job_id}``
+    keeps working after the job itself is forgotten or the server restarts.
+    """
+
+    def __init__(self, store_dir: str = "cache/videos", max_bytes: int = 2 * 1024 * 1024 * 1024,
+                 max_age: int = 7 * 24 * 3600):
+        self.disk = DiskLRUCache(store_dir, max_bytes, suffix=".mp4")
+        self.max_age = max_age
+        self.jobs_dir = os.path.join(store_dir, "jobs")
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        self._counts = {"hits": 0, "misses": 0, "coalesced": 0, "stored": 0}
+        self._lock = threading.Lock()
+
+    def make_key(self, text: str, language: str, renderer_version: str, theme: str,
+                 profile: str = "standard") -> str:
+        """Content hash of everything that determines the rendered video"""
+        payload = json.dumps(
+            {"text": normalize_text(text), "language": language,
+             "renderer": renderer_version, "theme": theme, "profile": profile},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Path of the stored video, or None"""
+        path = self.disk.get_path(key)
+        self._count("hits" if path else "misses")
+        return path
+
+    def put(self, key: str, video_path: str) -> str:
+        """Move a rendered video into the store, returning the path it is now served from"""
+        if self.max_age > 0:
+            expired = self.disk.expire(self.max_age)
+            if expired:
+                logger.info(f"Expired {expired} stored videos")
+            self._expire_links(self.max_age)
+        stored_path = self.disk.put_file(key, video_path)
+        if stored_path is None:
+            # Too big for the store; keep serving it from where it was rendered
+            return video_path
+        self._count("stored")
+        return stored_path
+
+    def link(self, job_id: str, key: str):
+        """Remember which stored video a job was answered with"""
+        if not JOB_ID_RE.match(job_id):
+            return
+        try:
+            with open(os.path.join(self.jobs_dir, job_id), 'w') as f:
+                f.write(key)
+        except OSError as e:
+            logger.warning(f"Could not link job {job_id} to stored video: {e}")
+
+    def resolve(self, job_id: str):
+        """Path of the stored video a job was answered with, or None"""
+        if not JOB_ID_RE.match(job_id):
+            return None
+        link_path = os.path.join(self.jobs_dir, job_id)
+        try:
+            with open(link_path) as f:
+                key = f.read().strip()
+        except OSError:
+            return None
+        path = self.disk.get_path(key)
+        try:
+            if path is None:
+                # The video was evicted, so the link leads nowhere
+                os.remove(link_path)
+            else:
+                # Downloads keep the video in the store, so they keep its link too
+                now = time.time()
+                os.utime(link_path, (now, now))
+        except OSError:
+            pass
+        return path
+
+    def _expire_links(self, max_age: float):
+        """Drop job links older than ``max_age`` seconds; their videos are gone by then"""
+        cutoff = time.time() - max_age
+        for entry in os.scandir(self.jobs_dir):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+    def count_coalesced(self):
+        """Record a request that joined an identical render already in flight"""
+        self._count("coalesced")
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters and store size"""
+        hits = self._counts["hits"] + self._counts["coalesced"]
+        lookups = self._counts["hits"] + self._counts["misses"]
+        return {
+            **self._counts,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.disk),
+            "bytes": self.disk.total_bytes
+        }
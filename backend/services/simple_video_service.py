@@ -1,25 +1,40 @@
 import os
 import asyncio
+import tempfile
+import numpy as np
 from moviepy.editor import (
     AudioFileClip, ColorClip, CompositeVideoClip, 
     concatenate_videoclips, ImageClip
 )
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+from services.ffmpeg_encoder import encode_frames
+from services.hls_writer import HLSWriter
+from services.backgrounds import gradient_image
+from services.text_layout import TextLayoutEngine
+from services.text_chunking import split_sentences
+from services.workspace import JobWorkspace
+from services.metrics import REGISTRY, RENDER_STEP_SECONDS
 import logging
 
 logger = logging.getLogger(__name__)
 
 class SimpleVideoService:
-    def __init__(self):
+    def __init__(self, keep_slides: bool = False):
         self.output_dir = "outputs"
+        # Slides stay in memory; keep_slides also writes them to outputs/ for debugging
+        self.keep_slides = keep_slides
         os.makedirs(self.output_dir, exist_ok=True)
         
         # Video settings
         self.video_size = (1280, 720)  # HD resolution
         self.background_color = (52, 152, 219)  # Modern blue
         self.text_color = (255, 255, 255)  # White text
+        
+        # Word-wrapping with cached word widths
+        self.text_layout = TextLayoutEngine()
     
-    async def create_video(self, summary_text: str, audio_path: str, video_id: str) -> str:
+    async def create_video(self, summary_text: str, audio_path: str, video_id: str,
+                           encoder: str = 'moviepy', narration: dict = None, work_dir: str = None) -> str:
         """Create video with narration and simple text slides"""
         try:
             # Run in thread pool to avoid blocking
@@ -29,77 +44,43 @@ class SimpleVideoService:
                 self._create_video_sync, 
                 summary_text, 
                 audio_path, 
-                video_id
+                video_id,
+                encoder,
+                narration,
+                work_dir
             )
         except Exception as e:
             logger.error(f"Error creating video: {e}")
             raise
     
-    def _create_text_image(self, text: str, filename: str) -> str:
-        """Create a visually appealing text image using PIL"""
+    def _create_text_image(self, text: str) -> np.ndarray:
+        """Create a visually appealing text slide using PIL, as an RGB frame"""
         try:
-            # Create image with gradient background
-            img = Image.new('RGB', self.video_size, self.background_color)
+            # Create image with a subtle top-to-bottom gradient background
+            img = gradient_image(self.background_color, self.video_size, 0.1)
             draw = ImageDraw.Draw(img)
             
-            # Create a subtle gradient effect
-            for y in range(self.video_size[1]):
-                # Create a subtle gradient from top to bottom
-                factor = y / self.video_size[1]
-                r = int(self.background_color[0] * (1 - factor * 0.1))
-                g = int(self.background_color[1] * (1 - factor * 0.1))
-                b = int(self.background_color[2] * (1 - factor * 0.1))
-                draw.line([(0, y), (self.video_size[0], y)], fill=(r, g, b))
-            
-            # Try to use a better font with larger size
-            font_size = 60
-            try:
-                font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", font_size)
-            except:
-                try:
-                    font = ImageFont.truetype("arial.ttf", font_size)
-                except:
-                    try:
-                        font = ImageFont.truetype("C:/Windows/Fonts/calibri.ttf", font_size)
-                    except:
-                        font = ImageFont.load_default()
-            
-            # Split text into lines for better readability
-            words = text.split()
-            lines = []
-            current_line = ""
-            
-            for word in words:
-                test_line = current_line + " " + word if current_line else word
-                bbox = draw.textbbox((0, 0), test_line, font=font)
-                if bbox[2] - bbox[0] < self.video_size[0] - 100:  # Leave 50px margin on each side
-                    current_line = test_line
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            
-            if current_line:
-                lines.append(current_line)
-            
-            # Calculate total text height
-            line_height = font_size + 10
-            total_height = len(lines) * line_height
-            
-            # Calculate starting Y position to center all lines
-            start_y = (self.video_size[1] - total_height) // 2
+            # Wrap and center the text, leaving a 50px margin on each side
+            layout = self.text_layout.layout(
+                text,
+                (50, 40, self.video_size[0] - 100, self.video_size[1] - 80),
+                font_size=60,
+                line_spacing=10
+            )
+            font = layout['font']
             
             # Draw each line with shadow effect
-            for i, line in enumerate(lines):
-                y_pos = start_y + i * line_height
+            for line_info in layout['lines']:
+                line = line_info['text']
+                x_pos, y_pos = line_info['x'], line_info['y']
                 
                 # Draw text shadow (slight offset)
                 shadow_offset = 3
-                draw.text((shadow_offset, y_pos + shadow_offset), line, 
+                draw.text((x_pos + shadow_offset, y_pos + shadow_offset), line, 
                          fill=(0, 0, 0, 128), font=font)
                 
                 # Draw main text
-                draw.text((0, y_pos), line, fill=self.text_color, font=font)
+                draw.text((x_pos, y_pos), line, fill=self.text_color, font=font)
             
             # Add a subtle border/frame
             border_width = 5
@@ -107,108 +88,168 @@ class SimpleVideoService:
                           (self.video_size[0] - border_width, self.video_size[1] - border_width)], 
                          outline=(255, 255, 255, 50), width=border_width)
             
-            # Save image with high quality
-            image_path = os.path.join(self.output_dir, filename)
-            img.save(image_path, quality=95)
-            return image_path
+            return np.asarray(img)
             
         except Exception as e:
             logger.error(f"Error creating text image: {e}")
             # Create a simple colored background as fallback
             img = Image.new('RGB', self.video_size, self.background_color)
-            image_path = os.path.join(self.output_dir, filename)
-            img.save(image_path)
-            return image_path
+            return np.asarray(img)
+    
+    def _save_debug_slide(self, frame: np.ndarray, video_id: str, index: int):
+        """Write a slide to outputs/ when keep_slides is on"""
+        if self.keep_slides:
+            image_path = os.path.join(self.output_dir, f"{video_id}_slide_{index}.png")
+            Image.fromarray(frame).save(image_path)
+            logger.info(f"Kept slide {image_path}")
     
-    def _create_video_sync(self, summary_text: str, audio_path: str, video_id: str) -> str:
+    def _create_video_sync(self, summary_text: str, audio_path: str, video_id: str,
+                           encoder: str = 'moviepy', narration: dict = None, work_dir: str = None) -> str:
         """Synchronous video creation using simple images"""
         try:
             # Load audio to get duration
             audio = AudioFileClip(audio_path)
             total_duration = audio.duration
             
-            # Split summary into sentences for slides
-            sentences = [s.strip() + '.' for s in summary_text.split('.') if s.strip()]
-            
-            if not sentences:
-                sentences = [summary_text]
-            
-            # Calculate duration per slide with minimum duration for readability
-            slide_duration = max(4.0, total_duration / len(sentences))
+            if narration:
+                # One slide per narrated sentence, shown for exactly as long as it is spoken
+                sentences = list(narration['sentences'])
+                slide_durations = self._narration_durations(narration['durations'], total_duration)
+            else:
+                # Split summary into sentences for slides
+                sentences = split_sentences(summary_text) or [summary_text]
+                
+                # Calculate duration per slide with minimum duration for readability
+                slide_durations = self._slide_durations(total_duration, len(sentences))
+            if not slide_durations:
+                raise Exception("No video clips were created")
             
-            # Create video clips for each sentence
-            video_clips = []
-            current_time = 0
+            # Encode into scratch space, then move the finished MP4 into outputs/ atomically
+            workspace = JobWorkspace(video_id, work_dir or tempfile.mkdtemp(prefix=f"{video_id}-"))
+            scratch_path = workspace.file(f"{video_id}.mp4")
             
-            for i, sentence in enumerate(sentences):
-                # Determine actual duration for this slide
-                if i == len(sentences) - 1:
-                    # Last slide gets remaining time
-                    duration = total_duration - current_time
+            try:
+                if encoder == 'hls':
+                    audio.close()
+                    self._render_hls(sentences, slide_durations, audio_path, video_id, scratch_path)
                 else:
-                    duration = min(slide_duration, total_duration - current_time)
-                
-                if duration <= 0:
-                    break
-                
-                # Create text image
-                image_filename = f"{video_id}_slide_{i}.png"
-                image_path = self._create_text_image(sentence, image_filename)
-                
-                # Create video clip from image
-                try:
-                    slide = ImageClip(image_path, duration=duration)
-                    video_clips.append(slide)
-                except Exception as e:
-                    logger.error(f"Error creating slide {i}: {e}")
-                    # Create a simple colored background as fallback
-                    background = ColorClip(
-                        size=self.video_size,
-                        color=self.background_color,
-                        duration=duration
-                    )
-                    video_clips.append(background)
-                
-                current_time += duration
-                
-                # Clean up image file
-                try:
-                    os.remove(image_path)
-                except:
-                    pass
-            
-            # Concatenate all slides
-            if video_clips:
-                final_video = concatenate_videoclips(video_clips)
+                    # Create text slides for each sentence, in memory
+                    slides = []
+                    for i, (sentence, _) in enumerate(zip(sentences, slide_durations)):
+                        with REGISTRY.timer(RENDER_STEP_SECONDS, step="slide"):
+                            slide = self._create_text_image(sentence)
+                        self._save_debug_slide(slide, video_id, i)
+                        slides.append(slide)
+                    
+                    with REGISTRY.timer(RENDER_STEP_SECONDS, step="encode", encoder=encoder):
+                        if encoder == 'ffmpeg':
+                            # Raw frames are piped straight into ffmpeg
+                            audio.close()
+                            encode_frames(slides, slide_durations, audio_path, scratch_path)
+                        else:
+                            temp_audio_path = workspace.file(f"{video_id}_temp-audio.m4a")
+                            self._write_moviepy_video(slides, slide_durations, audio, scratch_path, temp_audio_path)
                 
-                # Set audio
-                final_video = final_video.set_audio(audio)
-                
-                # Export video
-                video_path = os.path.join(self.output_dir, f"{video_id}.mp4")
-                final_video.write_videofile(
-                    video_path,
-                    fps=24,
-                    codec='libx264',
-                    audio_codec='aac',
-                    temp_audiofile='temp-audio.m4a',
-                    remove_temp=True,
-                    verbose=False,
-                    logger=None,
-                    preset='ultrafast'
-                )
-                
-                # Cleanup
-                final_video.close()
-                audio.close()
-                for clip in video_clips:
-                    clip.close()
-                
-                logger.info(f"Video saved to {video_path}")
-                return video_path
-            else:
-                raise Exception("No video clips were created")
+                video_path = workspace.commit(f"{video_id}.mp4", os.path.join(self.output_dir, f"{video_id}.mp4"))
+            finally:
+                # A work_dir passed in belongs to the caller
+                if work_dir is None:
+                    workspace.cleanup()
+            
+            logger.info(f"Video saved to {video_path}")
+            return video_path
                 
         except Exception as e:
             logger.error(f"Error in video creation: {e}")
             raise
+    
+    def stream_dir(self, video_id: str) -> str:
+        """Directory holding the HLS playlist and segments of a streamed render"""
+        return os.path.join(self.output_dir, f"{video_id}_hls")
+    
+    def _narration_durations(self, durations: list, total_duration: float) -> list:
+        """Slide durations from the measured narration of each sentence"""
+        # Joined MP3 segments keep each one's encoder padding, so the track runs slightly
+        # longer than the sum; spread the difference so slides stay in step with the voice
+        scale = total_duration / sum(durations) if sum(durations) > 0 else 1.0
+        return [duration * scale for duration in durations]
+    
+    def _slide_durations(self, total_duration: float, num_sentences: int) -> list:
+        """Split the narration into slide durations, at least 4 seconds each"""
+        slide_duration = max(4.0, total_duration / num_sentences)
+        durations = []
+        current_time = 0
+        
+        for i in range(num_sentences):
+            # Determine actual duration for this slide
+            if i == num_sentences - 1:
+                # Last slide gets remaining time
+                duration = total_duration - current_time
+            else:
+                duration = min(slide_duration, total_duration - current_time)
+            
+            if duration <= 0:
+                break
+            
+            durations.append(duration)
+            current_time += duration
+        
+        return durations
+    
+    def _render_hls(self, sentences: list, slide_durations: list, audio_path: str, video_id: str,
+                    video_path: str) -> str:
+        """Encode each slide as an HLS segment as soon as it is drawn, then join them into the MP4"""
+        writer = HLSWriter(self.stream_dir(video_id), audio_path, slide_durations)
+        
+        for i, (sentence, duration) in enumerate(zip(sentences, slide_durations)):
+            slide = self._create_text_image(sentence)
+            self._save_debug_slide(slide, video_id, i)
+            writer.add_slide(slide, duration)
+        
+        writer.finish(video_path)
+        logger.info(f"Video streamed to {self.stream_dir(video_id)}")
+        return video_path
+    
+    def _write_moviepy_video(self, slides: list, slide_durations: list,
+                             audio: AudioFileClip, video_path: str, temp_audio_path: str):
+        """Compose the slide frames with MoviePy and write the final video"""
+        # Create video clips for each slide
+        video_clips = []
+        for i, (frame, duration) in enumerate(zip(slides, slide_durations)):
+            try:
+                slide = ImageClip(frame, duration=duration)
+                video_clips.append(slide)
+            except Exception as e:
+                logger.error(f"Error creating slide {i}: {e}")
+                # Create a simple colored background as fallback
+                background = ColorClip(
+                    size=self.video_size,
+                    color=self.background_color,
+                    duration=duration
+                )
+                video_clips.append(background)
+        
+        # Concatenate all slides
+        final_video = concatenate_videoclips(video_clips)
+        
+        # Set audio
+        final_video = final_video.set_audio(audio)
+        
+        # Export video
+        final_video.write_videofile(
+            video_path,
+            fps=24,
+            codec='libx264',
+            audio_codec='aac',
+            temp_audiofile=temp_audio_path,
+            remove_temp=True,
+            verbose=False,
+            logger=None,
+            preset='ultrafast'
+        )
+        
+        # Cleanup
+        final_video.close()
+        audio.close()
+        for clip in video_clips:
+            clip.close()
@@ -0,0 +1,76 @@
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# pytorch: full fp32 model, int8: dynamically quantized Linear layers, onnx: ONNX Runtime
+BACKENDS = ('pytorch', 'int8', 'onnx')
+
+
+def load_summarizer(backend: str, model_name: str, tokenizer, onnx_cache_dir: str = "cache/onnx"):
+    """Build a summarization pipeline for the requested inference backend"""
+    from transformers import pipeline
+
+    if backend == 'pytorch':
+        return pipeline(
+            "summarization",
+            model=model_name,
+            tokenizer=tokenizer,
+            device=-1,  # Use CPU
+            framework="pt"
+        )
+    if backend == 'int8':
+        return _load_int8(model_name, tokenizer)
+    if backend == 'onnx':
+        return _load_onnx(model_name, tokenizer, onnx_cache_dir)
+    raise ValueError(f"Unknown summarizer backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+
+
+def _load_int8(model_name: str, tokenizer):
+    """fp32 weights with every Linear layer quantized to int8 at load time"""
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, pipeline
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    # Quantize in place so the fp32 Linear weights are released
+    torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    logger.info(f"Loaded {model_name} with dynamic int8 quantization")
+
+    return pipeline(
+        "summarization",
+        model=model,
+        tokenizer=tokenizer,
+        device=-1,
+        framework="pt"
+    )
+
+
+def _load_onnx(model_name: str, tokenizer, onnx_cache_dir: str):
+    """ONNX Runtime model, exported once and reused from the cache directory"""
+    from transformers import pipeline
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError:
+        raise RuntimeError(
+            "The onnx summarizer backend needs optimum with ONNX Runtime: "
+            "pip install 'optimum[onnxruntime]'"
+        )
+
+    export_dir = os.path.join(onnx_cache_dir, model_name.replace("/", "--"))
+    if os.path.exists(os.path.join(export_dir, "config.json")):
+        model = ORTModelForSeq2SeqLM.from_pretrained(export_dir)
+        logger.info(f"Loaded cached ONNX export from {export_dir}")
+    else:
+        logger.info(f"Exporting {model_name} to ONNX, this only happens once")
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+        os.makedirs(export_dir, exist_ok=True)
+        model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+
+    return pipeline(
+        "summarization",
+        model=model,
+        tokenizer=tokenizer,
+        device=-1
+    )
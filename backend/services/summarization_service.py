@@ -1,53 +1,139 @@
 import asyncio
-from transformers import pipeline, AutoTokenizer
+import threading
+import time
+from services.batch_inference import BatchingSummarizer
+from services.summarization_backends import load_summarizer
+from services.text_chunking import CHUNKER_VERSION, TokenChunker
+from services.metrics import REGISTRY, SUMMARIZER_GENERATE_SECONDS, SUMMARIZER_TOKENS
 import logging
 
 logger = logging.getLogger(__name__)
 
 class SummarizationService:
-    def __init__(self):
-        self.model_name = "facebook/bart-large-cnn"
+    def __init__(self, cache=None, max_batch_size: int = 1, max_batch_wait_ms: float = 10.0,
+                 backend: str = "pytorch", onnx_cache_dir: str = "cache/onnx", lazy: bool = False,
+                 model_name: str = "facebook/bart-large-cnn"):
+        self.model_name = model_name
+        self.backend = backend
+        self.onnx_cache_dir = onnx_cache_dir
         self.summarizer = None
         self.tokenizer = None
-        self._initialize_model()
+        self.batcher = None
+        self.chunker = None
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait_ms = max_batch_wait_ms
+        
+        # Generation settings for each chunk and for the final combined pass
+        self.chunk_params = {"max_length": 150, "min_length": 30, "do_sample": False}
+        self.final_params = {"max_length": 200, "min_length": 50, "do_sample": False}
+        
+        # Model loading state, shared by the warm-up thread and request threads
+        self._ready = threading.Event()
+        self._state_lock = threading.Lock()
+        self._loading_started = False
+        self._load_error = None
+        
+        if not lazy:
+            self.ensure_loaded()
+    
+    @property
+    def is_ready(self) -> bool:
+        """True once the model is loaded and requests can be served"""
+        return self._ready.is_set() and self._load_error is None
+    
+    def start_warmup(self):
+        """Load the model in a background thread so the server can start immediately"""
+        if not self._claim_loading():
+            return
+        threading.Thread(target=self._load_once, name="summarizer-warmup", daemon=True).start()
+    
+    def ensure_loaded(self, timeout: float = None):
+        """Block until the model is loaded, loading it here if nobody else is"""
+        if not self._ready.is_set():
+            if self._claim_loading():
+                self._load_once()
+            elif not self._ready.wait(timeout):
+                raise TimeoutError("Summarization model is still loading")
+        
+        if self._load_error is not None:
+            raise RuntimeError(f"Summarization model failed to load: {self._load_error}")
+    
+    def _claim_loading(self) -> bool:
+        """Return True for exactly one caller, which must then load the model"""
+        with self._state_lock:
+            if self._loading_started:
+                return False
+            self._loading_started = True
+            return True
+    
+    def _load_once(self):
+        """Load the model, recording any failure for the callers waiting on it"""
+        try:
+            self._initialize_model()
+        except Exception as e:
+            self._load_error = e
+        finally:
+            self._ready.set()
     
     def _initialize_model(self):
         """Initialize the summarization model and tokenizer"""
         try:
+            # Imported here so importing the API doesn't pay for transformers
+            from transformers import AutoTokenizer
+            
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.summarizer = pipeline(
-                "summarization",
-                model=self.model_name,
-                tokenizer=self.tokenizer,
-                device=-1,  # Use CPU
-                framework="pt"
+            self.summarizer = load_summarizer(
+                self.backend,
+                self.model_name,
+                self.tokenizer,
+                onnx_cache_dir=self.onnx_cache_dir
             )
-            logger.info("Summarization model loaded successfully")
+            self.chunker = TokenChunker(self.tokenizer)
+            if self.max_batch_size > 1:
+                self.batcher = BatchingSummarizer(
+                    self.summarizer,
+                    max_batch_size=self.max_batch_size,
+                    max_wait_ms=self.max_batch_wait_ms
+                )
+            logger.info(f"Summarization model loaded successfully ({self.backend} backend)")
         except Exception as e:
             logger.error(f"Error loading summarization model: {e}")
             raise
     
-    def _chunk_text(self, text: str, max_chunk_length: int = 900) -> list:
+    def _chunk_text(self, text: str) -> list:
         """Split text into chunks that fit the model's token limit"""
-        # Split by sentences first
-        sentences = text.split('. ')
-        chunks = []
-        current_chunk = ""
-        
-        for sentence in sentences:
-            # Estimate tokens (rough approximation: 1 token per 4 characters)
-            estimated_tokens = len(current_chunk + sentence) // 4
-            
-            if estimated_tokens > max_chunk_length and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
-            else:
-                current_chunk += sentence + ". "
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        return self.chunker.chunk(text)
+    
+    def _generate(self, texts: list, params: dict) -> list:
+        """Run the model over several texts, batching across requests when enabled"""
+        if not texts:
+            return []
+        start = time.perf_counter()
+        if self.batcher is not None:
+            summaries = self.batcher.summarize_many(texts, params)
+        else:
+            summaries = []
+            for text in texts:
+                summaries.append(self.summarizer(
+                    text,
+                    **params,
+                    truncation=True
+                )[0]['summary_text'])
         
-        return chunks
+        if REGISTRY.enabled:
+            SUMMARIZER_GENERATE_SECONDS.observe(time.perf_counter() - start)
+            # Re-tokenizing the output is cheap next to generating it
+            SUMMARIZER_TOKENS.inc(sum(len(ids) for ids in self.tokenizer(summaries)["input_ids"]))
+        return summaries
+    
+    def cache_stats(self) -> dict:
+        """Summary cache counters, or None when caching is disabled"""
+        return self.cache.stats() if self.cache is not None else None
+    
+    def batch_stats(self) -> dict:
+        """Micro-batching counters, or None when batching is disabled"""
+        return self.batcher.stats() if self.batcher is not None else None
     
     async def summarize(self, text: str) -> str:
         """Summarize the input text into key points"""
@@ -61,44 +147,53 @@ class SummarizationService:
     
     def _summarize_sync(self, text: str) -> str:
         """Synchronous summarization logic"""
+        # Requests that arrive during warm-up wait for the model instead of failing
+        self.ensure_loaded()
+        
         try:
             # Clean and prepare text
             text = text.strip()
             if len(text) < 50:
                 return text
             
+            # Reuse an earlier summary of the same text and settings
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(
+                    text,
+                    self.model_name,
+                    {"chunk": self.chunk_params, "final": self.final_params, "backend": self.backend,
+                     "chunker": CHUNKER_VERSION}
+                )
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             # Chunk the text if it's too long
             chunks = self._chunk_text(text)
-            summaries = []
             
-            for chunk in chunks:
-                if len(chunk.strip()) < 50:
-                    summaries.append(chunk)
-                    continue
-                
-                # Generate summary for this chunk
-                summary = self.summarizer(
-                    chunk,
-                    max_length=150,
-                    min_length=30,
-                    do_sample=False,
-                    truncation=True
-                )[0]['summary_text']
-                
-                summaries.append(summary)
+            # Short chunks are kept as they are, the rest go through the model together
+            to_summarize = [chunk for chunk in chunks if len(chunk.strip()) >= 50]
+            generated = iter(self._generate(to_summarize, self.chunk_params))
+            summaries = [
+                next(generated) if len(chunk.strip()) >= 50 else chunk
+                for chunk in chunks
+            ]
             
             # Combine all summaries
             final_summary = " ".join(summaries)
             
+            # Many chunk summaries can still overflow the window; condense them chunk by chunk
+            while len(chunks) > 1 and self.chunker.count_tokens([final_summary])[0] > self.chunker.max_tokens:
+                chunks = self._chunk_text(final_summary)
+                final_summary = " ".join(self._generate(chunks, self.chunk_params))
+            
             # If combined summary is still too long, summarize again
             if len(final_summary) > 1000:
-                final_summary = self.summarizer(
-                    final_summary,
-                    max_length=200,
-                    min_length=50,
-                    do_sample=False,
-                    truncation=True
-                )[0]['summary_text']
+                final_summary = self._generate([final_summary], self.final_params)[0]
+            
+            if cache_key is not None:
+                self.cache.put(cache_key, final_summary)
             
             return final_summary
             
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import threading
+import unicodedata
+from services.lru_cache import MemoryLRUCache, DiskLRUCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of the input so trivial whitespace edits still hit the cache"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class SummaryCache:
+    """Two-tier cache of summaries keyed on input text and model parameters"""
+
+    def __init__(self, cache_dir: str = "cache/summaries", max_memory_entries: int = 256,
+                 max_disk_bytes: int = 64 * 1024 * 1024):
+        self.memory = MemoryLRUCache(max_memory_entries)
+        self.disk = DiskLRUCache(cache_dir, max_disk_bytes, suffix=".txt")
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def make_key(self, text: str, model_name: str, params: dict) -> str:
+        """Content hash of the normalized text, model name and generation parameters"""
+        payload = json.dumps(
+            {"text": normalize_text(text), "model": model_name, "params": params},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached summary or None"""
+        summary = self.memory.get(key)
+        if summary is not None:
+            self._count("memory_hits")
+            return summary
+
+        data = self.disk.get(key)
+        if data is not None:
+            summary = data.decode("utf-8")
+            self.memory.put(key, summary)
+            self._count("disk_hits")
+            return summary
+
+        self._count("misses")
+        return None
+
+    def put(self, key: str, summary: str):
+        self.memory.put(key, summary)
+        self.disk.put(key, summary.encode("utf-8"))
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters and tier sizes"""
+        hits = self._counts["memory_hits"] + self._counts["disk_hits"]
+        lookups = hits + self._counts["misses"]
+        return {
+            **self._counts,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_entries": len(self.disk),
+            "disk_bytes": self.disk.total_bytes
+        }
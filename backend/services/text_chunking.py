@@ -0,0 +1,197 @@
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sentence terminators: Latin, Devanagari danda/double danda (Hindi), CJK full stops
+_TERMINATORS = ".!?।॥。！？"
+
+# A sentence ends at a terminator (plus closing quotes/brackets) followed by whitespace,
+# or at a blank line
+_SENTENCE_END = re.compile(
+    rf"(?<=[{_TERMINATORS}])[\"'”’)\]]*\s+|\n\s*\n"
+)
+
+# Abbreviations that end in a period without ending the sentence
+_ABBREVIATIONS = {
+    "mr", "mrs", "dr", "prof", "vs", "e.g", "i.e", "fig", "approx"
+}
+
+# Abbreviations that often end a sentence too ("The answer was no."); they only
+# count as abbreviations when the next word starts in lowercase or with a digit
+_AMBIGUOUS_ABBREVIATIONS = {
+    "ms", "sr", "jr", "st", "etc", "no", "inc", "ltd", "co", "dept"
+}
+
+# Dotted initialisms: U.S., U.K., p.m., a.m., Ph.D.
+_INITIALISM = re.compile(r"^(?:[a-z]{1,2}\.)+[a-z]$")
+
+# Words that start a new sentence after an initialism ("... in the U.S. The ...");
+# any other capitalized word continues it ("the U.S. Army")
+_SENTENCE_STARTERS = {
+    "a", "an", "the", "this", "that", "these", "those", "it", "its", "he", "she", "they",
+    "we", "i", "you", "there", "here", "but", "and", "so", "yet", "in", "on", "at", "for",
+    "if", "when", "while", "after", "before", "however", "then", "meanwhile"
+}
+
+_BLANK_LINE = re.compile(r"\n\s*\n")
+
+# Bump whenever sentence splitting or chunking changes, so cached summaries of the old chunks stop matching
+CHUNKER_VERSION = "2"
+
+# Fallback when a tokenizer reports no usable maximum length
+DEFAULT_MAX_TOKENS = 1024
+
+
+def _next_word(following: str) -> str:
+    words = following.lstrip("(\"'“‘ ").split(None, 1)
+    return words[0] if words else ""
+
+
+def _is_abbreviation(word: str, following: str) -> bool:
+    """Whether ``word.`` abbreviates rather than ends a sentence, given the text after it"""
+    next_word = _next_word(following)
+    next_char = next_word[:1]
+    if word in _ABBREVIATIONS:
+        return True
+    if word in _AMBIGUOUS_ABBREVIATIONS:
+        return next_char.isdigit()
+    if _INITIALISM.match(word):
+        return bool(next_word) and next_word.strip(",;:").lower() not in _SENTENCE_STARTERS
+    return False
+
+
+def split_sentences(text: str) -> list:
+    """Split text into sentences for English, Spanish, Hindi and Tamil input.
+
+    Terminators are kept with their sentence. Common abbreviations,
+    dotted initialisms, terminators followed by a lowercase word and decimal
+    numbers do not end a sentence; a blank line always does.
+    """
+    sentences = []
+    pending = ""
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        piece = text[start:match.start()] + text[match.start():match.end()].rstrip()
+        start = match.end()
+        candidate = (pending + " " + piece.strip()).strip() if pending else piece.strip()
+
+        last_word = candidate.rsplit(None, 1)[-1] if candidate else ""
+        following = text[start:]
+        # A sentence never starts in lowercase ("“Really?” she asked."), but a blank line always ends one
+        if not _BLANK_LINE.search(match.group()) and (
+                _next_word(following)[:1].islower()
+                or (last_word.endswith(".")
+                    and _is_abbreviation(last_word[:-1].lower().lstrip("(\"'"), following))):
+            pending = candidate
+            continue
+
+        if candidate:
+            sentences.append(candidate)
+        pending = ""
+
+    tail = text[start:].strip()
+    if pending or tail:
+        sentences.append((pending + " " + tail).strip())
+    return sentences
+
+
+class TokenChunker:
+    """Packs whole sentences into chunks that fit the model's real token window.
+
+    Token counts come from the model's own tokenizer in one batch-encode pass,
+    so multilingual text is measured exactly instead of estimated from its
+    character count.
+    """
+
+    def __init__(self, tokenizer, max_tokens: int = None):
+        self.tokenizer = tokenizer
+        if max_tokens is None:
+            model_max = getattr(tokenizer, "model_max_length", DEFAULT_MAX_TOKENS)
+            # Tokenizers without a limit report a huge sentinel value
+            if not model_max or model_max > 100000:
+                model_max = DEFAULT_MAX_TOKENS
+            max_tokens = model_max - self._special_tokens()
+        self.max_tokens = max_tokens
+
+    def _special_tokens(self) -> int:
+        """Number of special tokens the tokenizer adds around a sequence"""
+        try:
+            return self.tokenizer.num_special_tokens_to_add()
+        except Exception:
+            return 2
+
+    def count_tokens(self, texts: list) -> list:
+        """Token counts of several texts from a single batch-encode call"""
+        if not texts:
+            return []
+        encoded = self.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    def chunk(self, text: str) -> list:
+        """Split text into the fewest in-order chunks that each fit the token window"""
+        sentences = split_sentences(text)
+        if not sentences:
+            return []
+
+        # Measure each sentence as it appears after a space inside a chunk
+        lengths = self.count_tokens([" " + sentence for sentence in sentences])
+
+        pieces = []
+        for sentence, length in zip(sentences, lengths):
+            if length > self.max_tokens:
+                pieces.extend(self._split_long_sentence(sentence))
+            else:
+                pieces.append((sentence, length))
+
+        chunks = self._pack(pieces)
+
+        # Joining can change a token or two at boundaries; re-measure so nothing is truncated
+        verified = []
+        for chunk, length in zip(chunks, self.count_tokens(chunks)):
+            words = chunk.split()
+            if length > self.max_tokens and len(words) > 1:
+                middle = len(words) // 2
+                verified.extend(self.chunk(" ".join(words[:middle])))
+                verified.extend(self.chunk(" ".join(words[middle:])))
+            else:
+                if length > self.max_tokens:
+                    logger.warning(f"Single word of {length} tokens exceeds the {self.max_tokens}-token window")
+                verified.append(chunk)
+        return verified
+
+    def _pack(self, pieces: list) -> list:
+        """Greedily fill each chunk up to the budget, which minimises the chunk count"""
+        chunks = []
+        current = []
+        current_tokens = 0
+        for piece, length in pieces:
+            if current and current_tokens + length > self.max_tokens:
+                chunks.append(" ".join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += length
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def _split_long_sentence(self, sentence: str) -> list:
+        """Break a sentence longer than the window at word boundaries"""
+        words = sentence.split()
+        lengths = self.count_tokens([" " + word for word in words])
+        logger.info(f"Splitting a {sum(lengths)}-token sentence to fit the {self.max_tokens}-token window")
+
+        pieces = []
+        current = []
+        current_tokens = 0
+        for word, length in zip(words, lengths):
+            if current and current_tokens + length > self.max_tokens:
+                pieces.append((" ".join(current), current_tokens))
+                current = []
+                current_tokens = 0
+            current.append(word)
+            current_tokens += length
+        if current:
+            pieces.append((" ".join(current), current_tokens))
+        return pieces
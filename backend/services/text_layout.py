@@ -0,0 +1,103 @@
+import threading
+import weakref
+from services.fonts import get_registry
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TextLayoutEngine:
+    """Word-wraps slide text into a box, measuring each word once per font.
+
+    Word advances are cached per font object, so wrapping is a single linear
+    pass that adds up cached widths instead of re-measuring a growing prefix
+    with ``textbbox``. If the wrapped text does not fit the box, the font is
+    shrunk step by step down to ``min_font_size``.
+    """
+
+    def __init__(self, registry=None, max_words_per_font: int = 10000):
+        self.registry = registry
+        self.max_words_per_font = max_words_per_font
+        self._widths = weakref.WeakKeyDictionary()  # font -> {word: advance}
+        self._lock = threading.Lock()
+
+    def word_width(self, font, word: str) -> float:
+        """Advance width of a word, measured once per font"""
+        with self._lock:
+            widths = self._widths.get(font)
+            if widths is None:
+                widths = self._widths[font] = {}
+            width = widths.get(word)
+        if width is None:
+            width = font.getlength(word)
+            with self._lock:
+                if len(widths) >= self.max_words_per_font:
+                    widths.clear()
+                widths[word] = width
+        return width
+
+    def wrap(self, words: list, font, max_width: float) -> list:
+        """Greedy wrap into (line, width) pairs; a word wider than the box gets its own line"""
+        space = self.word_width(font, " ")
+        lines = []
+        current = []
+        current_width = 0.0
+
+        for word in words:
+            width = self.word_width(font, word)
+            if current and current_width + space + width > max_width:
+                lines.append((" ".join(current), current_width))
+                current = [word]
+                current_width = width
+            elif current:
+                current.append(word)
+                current_width += space + width
+            else:
+                current = [word]
+                current_width = width
+
+        if current:
+            lines.append((" ".join(current), current_width))
+        return lines
+
+    def layout(self, text: str, box: tuple, font_size: int, min_font_size: int = 24,
+               line_spacing: int = 10, language: str = None) -> dict:
+        """Fit text into box = (x, y, width, height), centering every line.
+
+        Returns the font and font size used, the line height, and one
+        ``{"text", "x", "y", "width"}`` dict per line.
+        """
+        registry = self.registry or get_registry()
+        box_x, box_y, box_width, box_height = box
+        words = text.split()
+
+        size = font_size
+        while True:
+            font = registry.font_for_text(text, size, language)
+            lines = self.wrap(words, font, box_width)
+            line_height = size + line_spacing
+            total_height = len(lines) * line_height
+            widest = max((width for _, width in lines), default=0)
+            if (total_height <= box_height and widest <= box_width) or size <= min_font_size:
+                break
+            # Shrink by about 10% and try again
+            size = max(min_font_size, size - max(2, size // 10))
+
+        if size < font_size:
+            logger.debug(f"Shrunk slide text from {font_size}px to {size}px to fit")
+
+        start_y = box_y + (box_height - total_height) // 2
+        return {
+            "font": font,
+            "font_size": size,
+            "line_height": line_height,
+            "lines": [
+                {
+                    "text": line,
+                    "x": box_x + int(box_width - width) // 2,
+                    "y": start_y + i * line_height,
+                    "width": int(round(width))
+                }
+                for i, (line, width) in enumerate(lines)
+            ]
+        }
@@ -0,0 +1,49 @@
+import hashlib
+import json
+import threading
+from services.lru_cache import DiskLRUCache
+from services.summary_cache import normalize_text
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TTSCache:
+    """On-disk LRU cache of narrated sentences, stored as MP3"""
+
+    def __init__(self, cache_dir: str = "cache/tts", max_bytes: int = 256 * 1024 * 1024):
+        self.disk = DiskLRUCache(cache_dir, max_bytes, suffix=".mp3")
+        self._counts = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def make_key(self, text: str, language: str, engine: str, voice: str) -> str:
+        """Content hash of the normalized sentence, language, engine and voice"""
+        payload = json.dumps(
+            {"text": normalize_text(text), "language": language, "engine": engine, "voice": voice},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached MP3 bytes or None"""
+        data = self.disk.get(key)
+        self._count("hits" if data is not None else "misses")
+        return data
+
+    def put(self, key: str, audio: bytes):
+        self.disk.put(key, audio)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters and cache size"""
+        lookups = self._counts["hits"] + self._counts["misses"]
+        return {
+            **self._counts,
+            "hit_rate": round(self._counts["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(self.disk),
+            "bytes": self.disk.total_bytes
+        }
@@ -0,0 +1,101 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from moviepy.config import get_setting
+import logging
+
+logger = logging.getLogger(__name__)
+
+# gtts: Google Translate TTS (network), espeak: local espeak-ng, stub: deterministic tones for tests
+ENGINES = ('gtts', 'espeak', 'stub')
+
+# Every engine writes MP3 in gTTS's format, so sentences from any engine can be joined without re-encoding
+MP3_ARGS = ['-ar', '24000', '-ac', '1', '-c:a', 'libmp3lame', '-b:a', '32k',
+            '-map_metadata', '-1', '-fflags', '+bitexact', '-flags:a', '+bitexact']
+
+
+def _encode_mp3(input_args: list, output_path: str):
+    command = [get_setting("FFMPEG_BINARY"), '-y', '-loglevel', 'error'] + input_args + MP3_ARGS + [output_path]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with {result.returncode}: {result.stderr.strip()[-500:]}")
+
+
+class GTTSEngine:
+    """Google Translate TTS; ``voice`` is the accent's Google domain (com, co.uk, co.in, ...)"""
+
+    name = 'gtts'
+
+    def __init__(self, voice: str = None):
+        from gtts import gTTS
+        self._gtts = gTTS
+        self.voice = voice or 'com'
+
+    def synthesize(self, text: str, language: str, output_path: str):
+        tts = self._gtts(
+            text=text,
+            lang=language,
+            slow=False,
+            tld=self.voice
+        )
+        tts.save(output_path)
+
+
+class EspeakEngine:
+    """Offline synthesis with espeak-ng; ``voice`` is an espeak voice name, defaulting to the language"""
+
+    name = 'espeak'
+
+    def __init__(self, voice: str = None):
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+        if self.binary is None:
+            raise RuntimeError("The espeak TTS engine needs espeak-ng: apt-get install espeak-ng")
+        self.voice = voice or ''
+
+    def synthesize(self, text: str, language: str, output_path: str):
+        fd, wav_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            result = subprocess.run(
+                [self.binary, '-v', self.voice or language, '-w', wav_path, text],
+                capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"espeak exited with {result.returncode}: {result.stderr.strip()[-500:]}")
+            _encode_mp3(['-i', wav_path], output_path)
+        finally:
+            os.remove(wav_path)
+
+
+class StubEngine:
+    """Deterministic, network-free narration: a quiet tone whose length follows the text"""
+
+    name = 'stub'
+
+    # Roughly the pace of gTTS, so slide timings look realistic
+    SECONDS_PER_CHARACTER = 0.065
+
+    def __init__(self, voice: str = None):
+        self.voice = voice or 'tone'
+
+    def synthesize(self, text: str, language: str, output_path: str):
+        seconds = max(0.5, len(text) * self.SECONDS_PER_CHARACTER)
+        digest = hashlib.sha256(f"{language}:{text}".encode("utf-8")).digest()
+        frequency = 220 + digest[0] * 2
+        _encode_mp3([
+            '-f', 'lavfi', '-i', f"sine=frequency={frequency}:sample_rate=24000:duration={seconds:.3f}",
+            '-af', 'volume=0.1'
+        ], output_path)
+
+
+def load_engine(name: str, voice: str = None):
+    """Build the TTS engine with this name"""
+    if name == 'gtts':
+        return GTTSEngine(voice)
+    if name == 'espeak':
+        return EspeakEngine(voice)
+    if name == 'stub':
+        return StubEngine(voice)
+    raise ValueError(f"Unknown TTS engine {name!r}, expected one of {', '.join(ENGINES)}")
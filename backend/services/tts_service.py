@@ -1,12 +1,18 @@
 import os
+import shutil
+import time
 import asyncio
-from gtts import gTTS
+from concurrent.futures import ThreadPoolExecutor
+from services.tts_engines import load_engine
+from services.ffmpeg_encoder import audio_duration, concat_audio
+from services.text_chunking import split_sentences
+from services.metrics import REGISTRY, RENDER_STEP_SECONDS, TTS_SENTENCE_SECONDS
 import logging
 
 logger = logging.getLogger(__name__)
 
 class TTSService:
-    def __init__(self):
+    def __init__(self, engine=None, cache=None, max_workers: int = 4, max_retries: int = 2):
         self.language_map = {
             "en": "en",      # English
             "hi": "hi",      # Hindi
@@ -15,48 +21,103 @@ class TTSService:
         }
         self.output_dir = "outputs"
         os.makedirs(self.output_dir, exist_ok=True)
+        
+        # Synthesizer (gTTS unless an offline engine is configured) and sentence cache
+        self.engine = engine or load_engine('gtts')
+        self.cache = cache
+        
+        # Sentences are synthesized concurrently, bounded across all jobs
+        self.max_retries = max_retries
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="tts")
     
     async def text_to_speech(self, text: str, language: str, video_id: str) -> str:
         """Convert text to speech and save as audio file"""
-        try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None, 
-                self._create_audio_sync, 
-                text, 
-                language, 
-                video_id
-            )
-        except Exception as e:
-            logger.error(f"Error in text-to-speech: {e}")
-            raise
+        narration = await self.narrate(text, language, video_id)
+        return narration["audio_path"]
     
-    def _create_audio_sync(self, text: str, language: str, video_id: str) -> str:
-        """Synchronous TTS creation"""
+    async def narrate(self, text: str, language: str, video_id: str, work_dir: str = None) -> dict:
+        """Narrate text sentence by sentence.
+        
+        Returns the joined audio track with the sentences and the exact
+        length of each one's narration, for timing the slides. The track is
+        written to ``work_dir`` (the job's scratch directory) when given.
+        """
         try:
-            # Map language code
-            tts_language = self.language_map.get(language, "en")
-            
-            # Create TTS object
-            tts = gTTS(
-                text=text,
-                lang=tts_language,
-                slow=False,
-                tld='com'
-            )
+            sentences = self.split_sentences(text)
+            audio_dir = work_dir or self.output_dir
+            segment_dir = os.path.join(audio_dir, f"{video_id}_tts")
+            os.makedirs(segment_dir, exist_ok=True)
             
-            # Save audio file
-            audio_path = os.path.join(self.output_dir, f"{video_id}_narration.mp3")
-            tts.save(audio_path)
+            loop = asyncio.get_event_loop()
+            try:
+                segment_paths = [
+                    os.path.join(segment_dir, f"sentence_{i:04d}.mp3") for i in range(len(sentences))
+                ]
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(self._executor, self._synthesize_sentence, sentence, language, path)
+                    for sentence, path in zip(sentences, segment_paths)
+                ], return_exceptions=True)
+                # Every sentence has settled, so nothing is still writing into segment_dir
+                for result in results:
+                    if isinstance(result, BaseException):
+                        raise result
+                durations = results
+                
+                audio_path = os.path.join(audio_dir, f"{video_id}_narration.mp3")
+                with REGISTRY.timer(RENDER_STEP_SECONDS, step="narration_concat"):
+                    await loop.run_in_executor(None, concat_audio, segment_paths, audio_path)
+            finally:
+                shutil.rmtree(segment_dir, ignore_errors=True)
             
-            logger.info(f"Audio saved to {audio_path}")
-            return audio_path
+            logger.info(f"Audio saved to {audio_path} ({len(sentences)} sentences, {sum(durations):.1f}s)")
+            return {"audio_path": audio_path, "sentences": sentences, "durations": list(durations)}
             
         except Exception as e:
-            logger.error(f"Error creating audio: {e}")
+            logger.error(f"Error in text-to-speech: {e}")
             raise
     
+    def split_sentences(self, text: str) -> list:
+        """Sentences to narrate; pieces with nothing to pronounce are dropped"""
+        sentences = [s for s in split_sentences(text) if any(ch.isalnum() for ch in s)]
+        return sentences or [text.strip()]
+    
+    def _synthesize_sentence(self, sentence: str, language: str, segment_path: str) -> float:
+        """Narrate one sentence from the cache or the engine, retrying it alone; returns its duration"""
+        start = time.perf_counter()
+        # Map language code
+        tts_language = self.language_map.get(language, "en")
+        
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(sentence, tts_language, self.engine.name, self.engine.voice)
+            audio = self.cache.get(key)
+            if audio is not None:
+                with open(segment_path, "wb") as f:
+                    f.write(audio)
+                TTS_SENTENCE_SECONDS.observe(time.perf_counter() - start, engine=self.engine.name, cache="hit")
+                return audio_duration(segment_path)
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.engine.synthesize(sentence, tts_language, segment_path)
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Error creating audio for sentence: {e}")
+                    raise
+                logger.warning(f"TTS attempt {attempt + 1} failed, retrying: {e}")
+                time.sleep(0.5 * 2 ** attempt)
+        
+        TTS_SENTENCE_SECONDS.observe(time.perf_counter() - start, engine=self.engine.name, cache="miss")
+        if key is not None:
+            with open(segment_path, "rb") as f:
+                self.cache.put(key, f.read())
+        return audio_duration(segment_path)
+    
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the sentence cache, or None when it is disabled"""
+        return self.cache.stats() if self.cache is not None else None
+    
     def get_supported_languages(self) -> dict:
         """Return supported languages"""
         return {
@@ -64,4 +125,4 @@ class TTSService:
             "hi": "हिन्दी (Hindi)",
             "ta": "தமிழ் (Tamil)",
             "es": "Español (Spanish)"
-        }
\ No newline at end of file
+        }
@@ -1,9 +1,13 @@
 import os
 import asyncio
+import tempfile
 from moviepy.editor import (
     TextClip, AudioFileClip, CompositeVideoClip, 
     ColorClip, concatenate_videoclips
 )
+from services.ffmpeg_encoder import encode_slideshow
+from services.fonts import detect_script, get_registry
+from services.workspace import JobWorkspace
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,7 +24,8 @@ class VideoService:
         self.font_size = 48
         self.font = 'Arial-Bold'
     
-    async def create_video(self, summary_text: str, audio_path: str, video_id: str) -> str:
+    async def create_video(self, summary_text: str, audio_path: str, video_id: str,
+                           encoder: str = 'moviepy', work_dir: str = None) -> str:
         """Create video with narration and text slides"""
         try:
             # Run in thread pool to avoid blocking
@@ -30,13 +35,16 @@ class VideoService:
                 self._create_video_sync, 
                 summary_text, 
                 audio_path, 
-                video_id
+                video_id,
+                encoder,
+                work_dir
             )
         except Exception as e:
             logger.error(f"Error creating video: {e}")
             raise
     
-    def _create_video_sync(self, summary_text: str, audio_path: str, video_id: str) -> str:
+    def _create_video_sync(self, summary_text: str, audio_path: str, video_id: str,
+                           encoder: str = 'moviepy', work_dir: str = None) -> str:
         """Synchronous video creation"""
         try:
             # Load audio to get duration
@@ -82,7 +90,8 @@ class VideoService:
                         color=self.text_color,
                         size=self.video_size,
                         method='caption',
-                        font='Arial'  # Use a standard Windows font
+                        # ImageMagick takes a font file path; 'Arial' if no font was resolved
+                        font=get_registry().resolve(detect_script(sentence)) or 'Arial'
                     ).set_duration(duration)
                 except Exception as text_error:
                     logger.warning(f"Text clip creation failed: {text_error}")
@@ -112,37 +121,72 @@ class VideoService:
                 
                 current_time += duration
             
-            # Concatenate all slides
-            if video_clips:
-                final_video = concatenate_videoclips(video_clips)
-                
-                # Set audio
-                final_video = final_video.set_audio(audio)
-                
-                # Export video with Windows-compatible settings
-                video_path = os.path.join(self.output_dir, f"{video_id}.mp4")
-                final_video.write_videofile(
-                    video_path,
-                    fps=24,
-                    codec='libx264',
-                    audio_codec='aac',
-                    temp_audiofile='temp-audio.m4a',
-                    remove_temp=True,
-                    verbose=False,
-                    logger=None,
-                    preset='ultrafast'  # Faster encoding
-                )
-                
-                # Cleanup
-                final_video.close()
-                audio.close()
-                for clip in video_clips:
-                    clip.close()
-                
-                logger.info(f"Video saved to {video_path}")
-                return video_path
-            else:
+            if not video_clips:
                 raise Exception("No video clips were created")
+            
+            # Encode into scratch space, then move the finished MP4 into outputs/ atomically
+            workspace = JobWorkspace(video_id, work_dir or tempfile.mkdtemp(prefix=f"{video_id}-"))
+            scratch_path = workspace.file(f"{video_id}.mp4")
+            try:
+                if encoder == 'ffmpeg':
+                    # Every slide is static, so render one frame each and let ffmpeg hold it
+                    slide_images = []
+                    try:
+                        for i, clip in enumerate(video_clips):
+                            image_path = workspace.file(f"slide_{i}.png")
+                            clip.save_frame(image_path, t=0)
+                            slide_images.append(image_path)
+                        
+                        audio.close()
+                        encode_slideshow(
+                            slide_images,
+                            [clip.duration for clip in video_clips],
+                            audio_path,
+                            scratch_path
+                        )
+                    finally:
+                        for clip in video_clips:
+                            clip.close()
+                        for image_path in slide_images:
+                            try:
+                                os.remove(image_path)
+                            except OSError:
+                                pass
+                else:
+                    # Concatenate all slides
+                    final_video = concatenate_videoclips(video_clips)
+                    
+                    # Set audio
+                    final_video = final_video.set_audio(audio)
+                    
+                    # Export video with Windows-compatible settings
+                    final_video.write_videofile(
+                        scratch_path,
+                        fps=24,
+                        codec='libx264',
+                        audio_codec='aac',
+                        # Per-job scratch space, so concurrent renders don't share the temporary audio
+                        temp_audiofile=workspace.file(f"{video_id}_temp-audio.m4a"),
+                        remove_temp=True,
+                        verbose=False,
+                        logger=None,
+                        preset='ultrafast'  # Faster encoding
+                    )
+                    
+                    # Cleanup
+                    final_video.close()
+                    audio.close()
+                    for clip in video_clips:
+                        clip.close()
+                
+                video_path = workspace.commit(f"{video_id}.mp4", os.path.join(self.output_dir, f"{video_id}.mp4"))
+            finally:
+                # A work_dir passed in belongs to the caller
+                if work_dir is None:
+                    workspace.cleanup()
+            
+            logger.info(f"Video saved to {video_path}")
+            return video_path
                 
         except Exception as e:
             logger.error(f"Error in video creation: {e}")
@@ -0,0 +1,84 @@
+import errno
+import os
+import shutil
+import tempfile
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# tmpfs mount tried first for scratch files
+TMPFS_DIR = "/dev/shm"
+
+
+def commit_file(scratch_path: str, final_path: str) -> str:
+    """Move a finished file into place so readers never see it half-written"""
+    os.makedirs(os.path.dirname(os.path.abspath(final_path)), exist_ok=True)
+    try:
+        os.replace(scratch_path, final_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # tmpfs and the output directory are different filesystems: copy next to the
+        # destination first, then rename, which is atomic within one filesystem
+        partial_path = f"{final_path}.{uuid.uuid4().hex}.partial"
+        try:
+            shutil.copyfile(scratch_path, partial_path)
+            os.replace(partial_path, final_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        os.remove(scratch_path)
+    return final_path
+
+
+class JobWorkspace:
+    """Scratch directory of one job, removed by cleanup() whether the job succeeded or not"""
+
+    def __init__(self, job_id: str, path: str):
+        self.job_id = job_id
+        self.path = path
+
+    def file(self, name: str) -> str:
+        """Path of a scratch file in this workspace"""
+        return os.path.join(self.path, name)
+
+    def commit(self, name: str, final_path: str) -> str:
+        """Atomically move a scratch file to its final location"""
+        return commit_file(self.file(name), final_path)
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+
+class WorkspaceManager:
+    """Hands out per-job scratch directories, on tmpfs when it has room.
+
+    Narration segments, MoviePy's temporary audio and the video being encoded
+    live in the job's own directory, so concurrent renders never share a
+    temporary path and a failed job leaves nothing behind in ``outputs/``.
+    """
+
+    def __init__(self, root: str = None, min_free_bytes: int = 512 * 1024 * 1024):
+        base = root or self._default_base(min_free_bytes)
+        self.root = os.path.join(base, "ai-video-jobs")
+        os.makedirs(self.root, exist_ok=True)
+        logger.info(f"Job workspaces in {self.root}")
+
+    def _default_base(self, min_free_bytes: int) -> str:
+        # Container tmpfs mounts are often tiny, so only use one with room for a few renders
+        if os.path.isdir(TMPFS_DIR) and os.access(TMPFS_DIR, os.W_OK):
+            if shutil.disk_usage(TMPFS_DIR).free >= min_free_bytes:
+                return TMPFS_DIR
+        return tempfile.gettempdir()
+
+    def create(self, job_id: str) -> JobWorkspace:
+        """Make a fresh scratch directory for a job"""
+        path = tempfile.mkdtemp(prefix=f"{job_id}-", dir=self.root)
+        return JobWorkspace(job_id, path)
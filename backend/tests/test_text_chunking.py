@@ -0,0 +1,69 @@
+import pytest
+
+from services.text_chunking import DEFAULT_MAX_TOKENS, TokenChunker, split_sentences
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word, like a tokenizer with a tiny vocabulary"""
+
+    def __init__(self, model_max_length: int = 1024, special_tokens: int = 2):
+        self.model_max_length = model_max_length
+        self.special_tokens = special_tokens
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [list(range(len(text.split()))) for text in texts]}
+
+    def num_special_tokens_to_add(self):
+        return self.special_tokens
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("The U.S. Army arrived. It was late.", ["The U.S. Army arrived.", "It was late."]),
+    ("We meet at 5 p.m. today. Bring food.", ["We meet at 5 p.m. today.", "Bring food."]),
+    ("He has a Ph.D. in physics. Good.", ["He has a Ph.D. in physics.", "Good."]),
+    ("I moved to the U.S. The weather is nice.", ["I moved to the U.S.", "The weather is nice."]),
+    ("Mr. Smith said no. The answer was no. Next.", ["Mr. Smith said no.", "The answer was no.", "Next."]),
+    ("See No. 5 and Fig. 3. Done.", ["See No. 5 and Fig. 3.", "Done."]),
+    ("It costs approx. ten dollars. It rose 2.5 percent.", ["It costs approx. ten dollars.", "It rose 2.5 percent."]),
+    ("Ends in the U.S.\n\nNew paragraph.", ["Ends in the U.S.", "New paragraph."]),
+    ("“Really?” she asked. Yes!", ["“Really?” she asked.", "Yes!"]),
+    ("यह पहला वाक्य है। यह दूसरा है।", ["यह पहला वाक्य है।", "यह दूसरा है।"]),
+    ("No terminator at the end", ["No terminator at the end"]),
+    ("", []),
+])
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_window_leaves_room_for_special_tokens():
+    assert TokenChunker(WordTokenizer(model_max_length=1024)).max_tokens == 1022
+
+
+def test_unbounded_tokenizer_falls_back_to_default_window():
+    chunker = TokenChunker(WordTokenizer(model_max_length=int(1e30)))
+    assert chunker.max_tokens == DEFAULT_MAX_TOKENS - 2
+
+
+def test_sentences_filling_the_window_exactly_share_a_chunk():
+    chunker = TokenChunker(WordTokenizer(), max_tokens=6)
+    assert chunker.chunk("One two three. Four five six.") == ["One two three. Four five six."]
+
+
+def test_one_token_over_the_window_starts_a_new_chunk():
+    chunker = TokenChunker(WordTokenizer(), max_tokens=6)
+    assert chunker.chunk("One two three. Four five six seven.") == ["One two three.", "Four five six seven."]
+
+
+def test_long_sentence_is_split_at_words():
+    chunker = TokenChunker(WordTokenizer(), max_tokens=3)
+    chunks = chunker.chunk("a b c d e f g. Short one.")
+    assert chunks == ["a b c", "d e f", "g. Short one."]
+    assert all(length <= 3 for length in chunker.count_tokens(chunks))
+
+
+def test_chunks_keep_every_word_in_order():
+    text = "The U.S. Army arrived at 5 p.m. today. " * 40
+    chunker = TokenChunker(WordTokenizer(), max_tokens=25)
+    chunks = chunker.chunk(text)
+    assert " ".join(chunks).split() == text.split()
+    assert max(chunker.count_tokens(chunks)) <= 25
@@ -22,6 +22,8 @@ class VideoGenerator {
         this.progressText = document.getElementById('progress-text');
         this.videoPlayer = document.getElementById('video-player');
         this.downloadLink = document.getElementById('download-link');
+        this.hls = null;
+        this.streamAttached = false;
         
         // File upload elements
         this.fileUploadArea = document.getElementById('file-upload-area');
@@ -415,14 +417,11 @@ class VideoGenerator {
         try {
             this.setLoadingState(true);
             this.showProgress();
+            this.resetPlayer();
             
-            const response = await this.callGenerateAPI(text, language);
-            
-            if (response.ok) {
-                await this.handleSuccessResponse(response);
-            } else {
-                throw new Error(`Server error: ${response.status}`);
-            }
+            const job = await this.callGenerateAPI(text, language);
+            const finishedJob = await this.waitForJob(job.job_id);
+            await this.handleSuccessResponse(finishedJob);
         } catch (error) {
             this.handleError(error);
         } finally {
@@ -432,32 +431,100 @@ class VideoGenerator {
     }
 
     async callGenerateAPI(text, language) {
-        this.updateProgress(20, 'Sending request to server...');
+        this.updateProgress(10, 'Sending request to server...');
         
-        const response = await fetch(`${API_BASE_URL}/generate-video`, {
+        const response = await fetch(`${API_BASE_URL}/jobs`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
             body: JSON.stringify({
                 text: text,
-                language: language
+                language: language,
+                encoder: 'hls'
             })
         });
 
-        return response;
+        if (response.status === 429) {
+            throw new Error('Server busy');
+        }
+        if (!response.ok) {
+            throw new Error(`Server error: ${response.status}`);
+        }
+
+        return response.json();
     }
 
-    async handleSuccessResponse(response) {
-        this.updateProgress(60, 'Processing video...');
-        
-        const blob = await response.blob();
-        const videoUrl = URL.createObjectURL(blob);
+    async waitForJob(jobId) {
+        const stageProgress = {
+            queued: [15, 'Waiting for a free render worker...'],
+            summarizing: [30, 'Summarizing text...'],
+            tts: [50, 'Generating narration...'],
+            rendering: [70, 'Rendering video...']
+        };
+
+        while (true) {
+            const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`);
+            if (!response.ok) {
+                throw new Error(`Server error: ${response.status}`);
+            }
+
+            const job = await response.json();
+            if (job.state === 'done') {
+                return job;
+            }
+            if (job.state === 'failed') {
+                throw new Error(`Server error: ${job.error}`);
+            }
+
+            const [percentage, text] = stageProgress[job.state] || [15, 'Processing...'];
+            this.updateProgress(percentage, text);
+            if (job.stream_url && !this.streamAttached) {
+                // Start playing the first slides while the rest are still rendering
+                this.streamAttached = this.attachStream(`${API_BASE_URL}${job.stream_url}`);
+                if (this.streamAttached) {
+                    this.showOutput();
+                }
+            }
+            await new Promise(resolve => setTimeout(resolve, 1500));
+        }
+    }
+
+    resetPlayer() {
+        // Detach the previous video so the new job's stream or download takes its place
+        if (this.hls) {
+            this.hls.destroy();
+            this.hls = null;
+        }
+        this.streamAttached = false;
+        this.videoPlayer.removeAttribute('src');
+        this.videoPlayer.load();
+    }
+
+    attachStream(streamUrl) {
+        if (this.videoPlayer.canPlayType('application/vnd.apple.mpegurl')) {
+            // Safari plays HLS natively
+            this.videoPlayer.src = streamUrl;
+            return true;
+        } else if (window.Hls && Hls.isSupported()) {
+            this.hls = new Hls();
+            this.hls.loadSource(streamUrl);
+            this.hls.attachMedia(this.videoPlayer);
+            return true;
+        }
+        return false;
+    }
+
+    async handleSuccessResponse(job) {
+        this.updateProgress(90, 'Loading video...');
         
-        this.updateProgress(90, 'Finalizing...');
+        // The download endpoint serves byte ranges, so the player can seek without fetching the whole file
+        const videoUrl = `${API_BASE_URL}${job.download_url}`;
         
-        // Set up video player
-        this.videoPlayer.src = videoUrl;
+        // Keep playing this job's stream if it is attached, it now ends where the MP4 does
+        if (!this.streamAttached) {
+            this.videoPlayer.src = videoUrl;
+        }
         this.downloadLink.href = videoUrl;
         this.downloadLink.download = `ai-video-${Date.now()}.mp4`;
         
@@ -475,6 +542,8 @@ class VideoGenerator {
         
         if (error.message.includes('Failed to fetch')) {
             errorMessage = 'Cannot connect to the backend server. Please make sure the Python backend is running on port 8000.';
+        } else if (error.message.includes('Server busy')) {
+            errorMessage = 'The server is busy with other videos. Please try again in a moment.';
         } else if (error.message.includes('Server error')) {
             errorMessage = 'Server error occurred. Please check the backend logs and try again.';
         }